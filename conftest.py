@@ -17,6 +17,8 @@ Features:
     ✓ Configurable headless/headed mode for debugging and CI/CD environments
     ✓ Centralized browser options management through settings configuration
     ✓ Automatic browser cleanup after test execution
+    ✓ One browser per session (per xdist worker); each test gets a fresh context
+    ✓ Third-party tracker requests blocked (except for performance-marked tests)
     ✓ Runtime browser selection without code changes
     ✓ AUTOMATIC AI healing for all test failures (no decorators needed!)
     ✓ Auto-starts Ollama service if not running
@@ -29,6 +31,7 @@ Environment Variables:
     HEADLESS: Controls headless mode (true|false)
     OLLAMA_HOST: Ollama server URL (default: http://localhost:11434)
     OLLAMA_MODEL: Model to use for AI healing (default: llama3.1:8b)
+    RUN_SLOW: Run tests marked 'slow' (true|false, default: false)
 
 Usage Examples:
     # Run tests with default browser and AI healing
@@ -61,10 +64,13 @@ Date: [2025-07-29]
 """
 
 import os
+import re
 import json
+import logging
 import allure
 import pytest
 import pytest_asyncio
+from pytest_asyncio import is_async_test
 from config.settings import settings
 from playwright.async_api import Locator, TimeoutError as PlaywrightTimeoutError
 import threading
@@ -73,6 +79,8 @@ import asyncio
 from utils.ai_healing import get_ollama_service, find_page_object, ensure_ollama_ready
 from utils.browserstack import is_browserstack_enabled
 from utils.debug import debug_print
+# After config.settings, so .env is loaded before the decorator reads its env vars
+from utils.decorators.screenshot_decorator import screenshot_test_name
 from playwright.async_api import async_playwright
 
 # Import the visual regression fixture
@@ -84,11 +92,45 @@ from utils.network_mocking import api_mocker
 # Pytest fixtures (prevents auto-removal)
 pytest_fixtures = [visual_regression, api_mocker]
 
+# Session-end AI healing progress; shown at the level set by log_level in pytest.ini
+logger = logging.getLogger(__name__)
+
 # Thread-safe dictionary and lock for tracking test failure counts
 _ai_healing_fail_counts = defaultdict(int)
 _ai_healing_lock = threading.Lock()
 
-ollama_service = get_ollama_service()
+# Node ids of tests that failed for the last time; healed together at session end
+_ai_healing_final_keys = []
+
+# The healing service is built on first use through get_ollama_service() (cached),
+# so importing this conftest (collection, --help) never constructs it
+
+def _run_on_page_loop(coro, loop):
+    """
+    Run a page coroutine to completion from a synchronous hook.
+
+    Playwright objects belong to the loop that created them, so the coroutine has
+    to run on the loop the page fixture recorded (item._page_loop); a separate
+    thread/loop cannot drive the page. Between test phases that loop is idle and
+    is driven directly. If it is missing, closed or already running, the capture
+    is refused rather than deadlocking.
+    """
+    if loop is None or loop.is_closed() or loop.is_running():
+        coro.close()
+        raise RuntimeError("page event loop unavailable; page capture skipped")
+    return loop.run_until_complete(coro)
+
+# Test module source by path, as (mtime, text); re-read only if the file changed
+_test_file_cache = {}
+
+def _read_test_file(path):
+    """Read a test module once per change; parametrized/retried failures share the same file."""
+    mtime = os.path.getmtime(path)
+    cached = _test_file_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r') as f:
+            cached = _test_file_cache[path] = (mtime, f.read())
+    return cached[1]
 
 class ElementNotFoundException(Exception):
     """
@@ -210,46 +252,65 @@ async def patched_fill(self, *args, timeout=None, **kwargs):
 Locator.fill = patched_fill
 
 # ------------------------------------------------------------------------------
-# Fixture: page
+# Hook: pytest_collection_modifyitems
+# ------------------------------------------------------------------------------
+
+def pytest_collection_modifyitems(items):
+    """
+    Run every async test on the session-scoped event loop so the shared browser
+    (which is bound to the loop it was launched on) can be reused by all tests.
+    Tests marked 'slow' are skipped unless RUN_SLOW=true (e.g. full/nightly runs).
+    Each item also gets its sanitized screenshot name, computed once here.
+    """
+    session_scope_marker = pytest.mark.asyncio(loop_scope="session")
+    run_slow = os.getenv("RUN_SLOW", "false").lower() == "true"
+    skip_slow = pytest.mark.skip(reason="slow test; set RUN_SLOW=true to run")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+        if not run_slow and "slow" in item.keywords:
+            item.add_marker(skip_slow)
+        item._screenshot_name = screenshot_test_name(item.nodeid)
+
+# ------------------------------------------------------------------------------
+# Fixture: shared_browser
 # ------------------------------------------------------------------------------
 
-@pytest_asyncio.fixture
-async def page():
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_browser():
     """
-    Async pytest fixture that launches a Playwright browser page based on environment
-    variables or settings configuration. Supports Chromium, Firefox, and WebKit.
+    Session-scoped fixture that launches (or connects to) a single browser and keeps
+    it warm for the whole run. Chromium startup dominates per-test cost, so tests get
+    a fresh context from this browser instead of a fresh browser process.
+    Playwright objects are bound to the loop that created them, so this fixture, the
+    page fixture and every async test run on the session loop (loop_scope="session").
+    Under pytest-xdist each worker process gets its own browser.
     Uses BrowserStack if BROWSERSTACK=true in environment.
 
     Yields:
-        Page: An instance of Playwright's Page object for test use.
+        Browser: A launched Playwright Browser instance.
 
     Raises:
         ValueError: If an unsupported browser name is specified.
     """
-    if is_browserstack_enabled():
-        caps = {
-            "browser": "chrome",
-            "browser_version": "latest",
-            "os": "osx",
-            "os_version": "sonoma",
-            "name": "Playwright Test",
-            "build": "playwright-python-build-1",
-            "browserstack.username": os.getenv("BROWSERSTACK_USERNAME"),
-            "browserstack.accessKey": os.getenv("BROWSERSTACK_ACCESS_KEY"),
-        }
-        ws_endpoint = (
-            f"wss://cdp.browserstack.com/playwright?caps={json.dumps(caps)}"
-        )
-        async with async_playwright() as p:
+    async with async_playwright() as p:
+        if is_browserstack_enabled():
+            caps = {
+                "browser": "chrome",
+                "browser_version": "latest",
+                "os": "osx",
+                "os_version": "sonoma",
+                "name": "Playwright Test",
+                "build": "playwright-python-build-1",
+                "browserstack.username": os.getenv("BROWSERSTACK_USERNAME"),
+                "browserstack.accessKey": os.getenv("BROWSERSTACK_ACCESS_KEY"),
+            }
+            ws_endpoint = (
+                f"wss://cdp.browserstack.com/playwright?caps={json.dumps(caps)}"
+            )
             browser = await p.chromium.connect(ws_endpoint)
-            context = await browser.new_context()
-            page = await context.new_page()
             print("\n Using BrowserStack cloud browser")
-            yield page
-            await browser.close()
-    else:
-        # ...existing local browser logic...
-        async with async_playwright() as p:
+        else:
             browser_name = os.getenv("BROWSER", settings.BROWSER).lower()
             headless = os.getenv("HEADLESS", str(settings.HEADLESS)).lower() == "true"
             browser_options = settings.get_browser_options()
@@ -262,11 +323,87 @@ async def page():
                 browser = await p.webkit.launch(**browser_options)
             else:
                 raise ValueError(f"Unsupported BROWSER value: {browser_name}")
-            context = await browser.new_context()
-            page = await context.new_page()
             print(f"\n Using {browser_name} browser (headless={headless})")
-            yield page
-            await browser.close()
+        yield browser
+        await browser.close()
+
+# ------------------------------------------------------------------------------
+# Function: _new_test_context
+# ------------------------------------------------------------------------------
+
+# Third-party analytics/tag hosts that add network and JS time without affecting the app
+TRACKER_URL_PATTERN = re.compile(
+    r"^https?://([^/]+\.)?("
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|"
+    r"segment\.(io|com)|hotjar\.com|newrelic\.com|nr-data\.net"
+    r")/"
+)
+
+async def _new_test_context(browser, request):
+    """
+    Create a browser context for a test, aborting requests to known third-party
+    trackers unless the test is marked 'performance' (which needs realistic page weight).
+    """
+    context = await browser.new_context()
+    if not request.node.get_closest_marker("performance"):
+        await context.route(TRACKER_URL_PATTERN, lambda route: route.abort())
+    return context
+
+# ------------------------------------------------------------------------------
+# Fixture: shared_contexts
+# ------------------------------------------------------------------------------
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_contexts(shared_browser):
+    """
+    Session-scoped registry of per-module browser contexts used by tests marked
+    'shared_context'. Session scope lets a module's context outlive each test and
+    be closed once when the session ends; like every fixture touching the shared
+    browser it runs on the session loop (loop_scope="session").
+
+    Yields:
+        dict: Mapping of test module name to its BrowserContext.
+    """
+    contexts = {}
+    yield contexts
+    for context in contexts.values():
+        await context.close()
+
+# ------------------------------------------------------------------------------
+# Fixture: page
+# ------------------------------------------------------------------------------
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def page(shared_browser, shared_contexts, request):
+    """
+    Async pytest fixture that provides a Playwright page in a fresh browser context
+    from the session's shared browser. The context is closed after each test, which
+    keeps tests isolated (cookies, storage, tabs) without paying browser launch cost.
+
+    Tests marked 'shared_context' (e.g. via a module-level pytestmark) instead get a
+    new page in one context shared by their whole module. Only use this for tests
+    that never log in, since cookies and storage carry over between them.
+
+    Yields:
+        Page: An instance of Playwright's Page object for test use.
+    """
+    # Failure hooks drive the page synchronously and need the loop it belongs to
+    request.node._page_loop = asyncio.get_running_loop()
+    if request.node.get_closest_marker("shared_context"):
+        module_name = request.module.__name__
+        context = shared_contexts.get(module_name)
+        if context is None:
+            context = await _new_test_context(shared_browser, request)
+            shared_contexts[module_name] = context
+        page = await context.new_page()
+        yield page
+        await page.close()
+        return
+
+    context = await _new_test_context(shared_browser, request)
+    page = await context.new_page()
+    yield page
+    await context.close()
 
 # ------------------------------------------------------------------------------
 # Hook: pytest_runtest_makereport
@@ -276,7 +413,8 @@ def pytest_runtest_makereport(item, call):
     """
     Hook that runs after each test phase (setup, call, teardown).
     Automatically captures context for AI healing on ANY test failure.
-    Triggers AI healing only on final failure (after all retries).
+    Queues AI healing only on final failure (after all retries); the queued
+    failures are healed together in pytest_sessionfinish.
     Thread-safe for parallel test runs.
 
     NO DECORATORS NEEDED - this applies to ALL tests automatically!
@@ -285,6 +423,7 @@ def pytest_runtest_makereport(item, call):
     rep = outcome.get_result()
 
     # Skip all AI healing logic if disabled
+    ollama_service = get_ollama_service()
     if not ollama_service.enabled:
         return
 
@@ -307,13 +446,16 @@ def pytest_runtest_makereport(item, call):
         page = find_page_object(item)
         error_message = str(call.excinfo.value) if call.excinfo else "Unknown error"
 
+        screenshot_path = None
+
         # Use async capture_failure_context for full context (including DOM)
         if page:
             try:
-                context, screenshot_path = asyncio.get_event_loop().run_until_complete(
+                context, screenshot_path = _run_on_page_loop(
                     ollama_service.capture_failure_context(
                         page, error_message, item.name, getattr(item.function, "__func__", None)
-                    )
+                    ),
+                    getattr(item, "_page_loop", None),
                 )
             except Exception as e:
                 print(f"🧠 Error capturing failure context: {e}")
@@ -338,21 +480,17 @@ def pytest_runtest_makereport(item, call):
         # Try to get the original test code
         original_test_code = ""
         try:
-            test_file = item.fspath
-            with open(test_file, 'r') as f:
-                original_test_code = f.read()
+            original_test_code = _read_test_file(str(item.fspath))
         except Exception as e:
             print(f"Warning: Could not read test file: {e}")
 
-        # Store context for later AI healing
-        if not hasattr(ollama_service, '_pending_contexts'):
-            ollama_service._pending_contexts = {}
-        ollama_service._pending_contexts[test_key] = {
+        # Queue context for later AI healing
+        ollama_service.queue_failure(test_key, {
             "test_name": item.name,
             "context": context,
             "original_test_code": original_test_code,
             "screenshot_path": screenshot_path,
-        }
+        })
 
         # This duplicates code in screenshot_decorator, but only runs if AI healing is on
         if screenshot_path and os.path.exists(screenshot_path):
@@ -360,51 +498,48 @@ def pytest_runtest_makereport(item, call):
                 allure.attach(
                     image_file.read(),
                     name=f"AI Healing Screenshot: {item.name}",
-                    attachment_type=allure.attachment_type.PNG
+                    attachment_type=allure.attachment_type.JPG
         )
 
-        # Only trigger AI healing on the final failure
+        # Only queue AI healing on the final failure; it runs at session end
         if fail_count > max_reruns:
-            print(f"\n🧠 Final failure detected for {item.name}, triggering AI healing")
-            if hasattr(ollama_service, '_pending_contexts'):
-                context_data = ollama_service._pending_contexts.get(test_key)
-                if not context_data:
-                    context_data = ollama_service._pending_contexts.get(item.name)
-                if context_data and ollama_service.enabled:
-                    if not ensure_ollama_ready():
-                        print("🧠 AI healing skipped - Ollama service or model unavailable")
-                        return
-                    try:
-                        ai_response = ollama_service.call_ollama_healing(
-                            context_data["context"],
-                            context_data["original_test_code"],
-                            context_data["screenshot_path"]
-                        )
-                        if ai_response:
-                            asyncio.run(ollama_service.generate_healing_report(
-                                context_data["test_name"],
-                                ai_response,
-                                context_data["context"]
-                            ))
-                        else:
-                            print(f"🧠 Ollama analysis failed for {item.name}")
-                        # Clean up
-                        if test_key in ollama_service._pending_contexts:
-                            del ollama_service._pending_contexts[test_key]
-                        if item.name in ollama_service._pending_contexts:
-                            del ollama_service._pending_contexts[item.name]
-                    except Exception as e:
-                        print(f"🧠 AI healing hook failed: {e}")
-                else:
-                    if not context_data:
-                        print(f"🧠 No context data found for {item.name}")
-                    if not ollama_service.enabled:
-                        print(f"🧠 AI healing disabled for {item.name}")
-            else:
-                print(f"🧠 No pending contexts found")
-            # Clean up fail count
+            print(f"\n🧠 Final failure detected for {item.name}, queued for AI healing")
             with _ai_healing_lock:
+                _ai_healing_final_keys.append(test_key)
+                # Clean up fail count
                 if test_key in _ai_healing_fail_counts:
                     del _ai_healing_fail_counts[test_key]
         else:
             print(f"🔄 Test {item.name} will be retried (attempt {fail_count}), skipping AI healing")
+
+# ------------------------------------------------------------------------------
+# Hook: pytest_sessionfinish
+# ------------------------------------------------------------------------------
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Runs AI healing for every test that failed for the last time in this session.
+    All pending contexts are sent to Ollama concurrently (AsyncClient + gather)
+    instead of one blocking request per failure.
+    """
+    if not _ai_healing_final_keys:
+        return
+    ollama_service = get_ollama_service()
+    if not ollama_service.enabled:
+        return
+
+    pending = ollama_service.drain_pending()
+    entries = [pending[key] for key in _ai_healing_final_keys if key in pending]
+    _ai_healing_final_keys.clear()
+    if not entries:
+        logger.info("🧠 No pending contexts found")
+        return
+
+    if not ensure_ollama_ready():
+        logger.warning("🧠 AI healing skipped - Ollama service or model unavailable")
+        return
+
+    logger.info("🧠 Running AI healing for %d failed test(s)", len(entries))
+    try:
+        asyncio.run(ollama_service.heal_failures(entries))
+    except Exception as e:
+        logger.warning("🧠 AI healing hook failed: %s", e)
@@ -10,7 +10,7 @@ on the application's dashboard page using Playwright.
 Features:
     ✓ Locators for user initials, display name, email, and user menu items.
     ✓ Methods to retrieve user information and interact with the user menu.
-    ✓ Usage of @property for clean locator access.
+    ✓ Locators bound once per page object for cheap repeated access.
     ✓ Async methods for Playwright compatibility.
 
 Usage Example:
@@ -28,7 +28,8 @@ Usage Example:
         assert email == "pmcneely@gmail.com"
 
 Conventions:
-    - All locators are defined as @property methods for clarity and reusability.
+    - All locators are bound once as attributes in __init__ so selectors are
+      not rebuilt on every access.
     - All Playwright actions and queries are implemented as async methods.
     - Page object is designed for maintainability and ease of use in tests.
 
@@ -36,73 +37,29 @@ Author: PMAC
 Date: [2025-07-27]
 ===============================================================================
 """
+import asyncio
 from data.personas import PERSONAS
 
 class DashboardPage:
     def __init__(self, page):
         self.page = page
-
-    # =====================================
-    # User Profile Elements
-    # =====================================
-    @property
-    def user_initials(self):
-        """Locator for the user initials in the avatar."""
-        return self.page.locator("h5.uni-avatar__initials.uni-avatar__initials--user").first
-
-    @property
-    def user_name(self):
-        """Locator for the user display name."""
-        return self.page.locator("div.hui-globaluseritem__display-name > span")
-
-    @property
-    def user_email(self):
-        """Locator for the user email address."""
-        return self.page.locator("div.hui-globaluseritem__email")
-
-    @property
-    def user_menu(self):
-        """Locator for the global user menu container."""
-        return self.page.locator("div.hui-globalusermenu")
-
-    @property
-    def user_avatar(self):
-        """Locator for the user avatar container."""
-        return self.page.locator("div.hui-globaluseritem__avatar")
-
-    # =====================================
-    # User Menu Items
-    # =====================================
-    @property
-    def your_profile_link(self):
-        """Locator for the 'Your Profile' menu item."""
-        return self.page.locator('[data-qa-id="webnav-usermenu-yourprofile"]')
-
-    @property
-    def account_settings_link(self):
-        """Locator for the 'Account Settings' menu item."""
-        return self.page.locator('[data-qa-id="webnav-usermenu-accountsettings"]')
-
-    @property
-    def livestream_purchases_link(self):
-        """Locator for the 'Livestream Purchases' menu item."""
-        return self.page.locator('[data-qa-id="webnav-usermenu-livestreampurchases"]')
-
-    @property
-    def tickets_passes_link(self):
-        """Locator for the 'Tickets & Passes' menu item."""
-        return self.page.locator('[data-qa-id="webnav-usermenu-ticketsandpasses"]')
-
-    @property
-    def get_help_link(self):
-        """Locator for the 'Get Help' menu item."""
-        return self.page.locator('[data-qa-id="webnav-usermenu-help"]')
-
-    @property
-    def logout_link(self):
-        """Locator for the 'Log Out' menu item."""
-        return self.page.get_by_role("link", name="Log Out")
-    
+        # Locators are bound once here so selectors are not rebuilt on every access;
+        # Playwright locators are lazy, so binding them before navigation is safe.
+
+        # User Profile Elements
+        self.user_initials = page.locator("h5.uni-avatar__initials.uni-avatar__initials--user").first
+        self.user_name = page.locator("div.hui-globaluseritem__display-name > span")
+        self.user_email = page.locator("div.hui-globaluseritem__email")
+        self.user_menu = page.locator("div.hui-globalusermenu")
+        self.user_avatar = page.locator("div.hui-globaluseritem__avatar")
+
+        # User Menu Items
+        self.your_profile_link = page.locator('[data-qa-id="webnav-usermenu-yourprofile"]')
+        self.account_settings_link = page.locator('[data-qa-id="webnav-usermenu-accountsettings"]')
+        self.livestream_purchases_link = page.locator('[data-qa-id="webnav-usermenu-livestreampurchases"]')
+        self.tickets_passes_link = page.locator('[data-qa-id="webnav-usermenu-ticketsandpasses"]')
+        self.get_help_link = page.locator('[data-qa-id="webnav-usermenu-help"]')
+        self.logout_link = page.get_by_role("link", name="Log Out")
 
     # =====================================
     # Helper Methods
@@ -130,14 +87,19 @@ class DashboardPage:
     async def get_user_profile_info(self):
         """Return avatar (initials, name, email) as a tuple."""
         #await self.click_user_avatar()
-        initials = await self.get_user_initials_text()
-        name = await self.get_user_name_text()
-        email = await self.get_user_email_text()
+        # The three reads are independent, so issue them concurrently
+        initials, name, email = await asyncio.gather(
+            self.get_user_initials_text(),
+            self.get_user_name_text(),
+            self.get_user_email_text(),
+        )
         return initials, name, email
 
     async def verify_user_profile_info(self):
         """Retrieve and validate user profile information"""
         initials, name, email = await self.get_user_profile_info()
-        assert initials == f"{PERSONAS['user']['first_name'][0]}{PERSONAS['user']['last_name'][0]}"
-        assert name == f"{PERSONAS['user']['first_name']} {PERSONAS['user']['last_name'][0]}"
-        assert email == PERSONAS["user"]["email"]
\ No newline at end of file
+        user = PERSONAS["user"]
+        first_name, last_name = user["first_name"], user["last_name"]
+        assert initials == f"{first_name[0]}{last_name[0]}"
+        assert name == f"{first_name} {last_name[0]}"
+        assert email == user["email"]
\ No newline at end of file
@@ -36,8 +36,7 @@ import pytest
 import os
 from pages.login_page import LoginPage
 from pages.app import App
-from utils.performance_monitor import PerformanceMetrics, PerformanceMonitorAsync
-from datetime import datetime
+from utils.performance_monitor import METRIC_FIELDS, RESOURCE_TOTALS_JS, PerformanceMetrics, PerformanceMonitorAsync
 # ------------------------------------------------------------------------------
 # Login Page Fixture with Auto-Navigation
 # ------------------------------------------------------------------------------
@@ -81,82 +80,143 @@ async def app(page):
     """
     return App(page)
 
-@pytest.fixture(scope="function")
-async def perf_monitor():
+# ------------------------------------------------------------------------------
+# Performance Monitoring Fixtures
+# ------------------------------------------------------------------------------
+
+# Read once at import: PERF_MONITOR=1 turns on real metrics collection and exports
+PERF_MONITOR_ENABLED = os.getenv("PERF_MONITOR", "0") == "1"
+
+class DummyMonitor:
     """
-    Performance monitor fixture for each test.
-    - If PERF_MONITOR=1 → use real PerformanceMonitorAsync and export files.
-    - Otherwise → use DummyMonitor that returns minimal metrics and does nothing else.
+    Stand-in used when PERF_MONITOR is not set. Returns minimal metrics without
+    touching the page and records nothing, so telemetry costs nothing in CI.
     """
-    if os.getenv("PERF_MONITOR", "0") != "1":
-        class DummyMonitor:
-            def __init__(self):
-                self.metrics_history = []
+    enabled = False
+    columns = {name: () for name in METRIC_FIELDS}
+    metrics_history = ()
+
+    async def measure_page_performance(self, page, url):
+        return PerformanceMetrics(url=url, timestamp=time.time())
+
+    async def measure_many(self, browser, urls, concurrency=4):
+        return [PerformanceMetrics(url=url, timestamp=time.time()) for url in urls]
 
-            async def measure_page_performance(self, page, url):
-                m = PerformanceMetrics(url=url, timestamp=time.time())
-                self.metrics_history.append(m)
-                return m
+    async def drain_observed_entries(self, page, label=None):
+        return PerformanceMetrics(url=label or page.url, timestamp=time.time())
 
-            async def measure_current_page(self, page, label=None):
-                try:
-                    current_url = await page.evaluate("() => location.href")
-                except Exception:
-                    current_url = "about:blank"
-                m = PerformanceMetrics(url=label or current_url, timestamp=time.time())
-                self.metrics_history.append(m)
-                return m
+    async def measure_current_page(self, page, label=None):
+        return PerformanceMetrics(url=label or page.url, timestamp=time.time())
 
-            def save_metrics_to_json(self, *args, **kwargs):
-                pass
+    def save_metrics_to_json(self, *args, **kwargs):
+        pass
 
-            def save_metrics_to_csv(self, *args, **kwargs):
-                pass
+    def save_metrics_to_csv(self, *args, **kwargs):
+        pass
 
-            def get_average_metrics(self):
-                return {}
+    def get_average_metrics(self):
+        return {}
 
-            def clear_metrics(self):
-                self.metrics_history.clear()
+    def get_percentile_metrics(self, p=50):
+        return {}
 
-            def print_metrics_summary(self, metrics):
-                # No-op: keep API parity with real monitor
-                pass
+    def clear_metrics(self):
+        pass
 
-        yield DummyMonitor()
+    def print_metrics_summary(self, metrics):
+        # No-op: keep API parity with real monitor
+        pass
+
+@pytest.fixture(scope="session")
+async def perf_report():
+    """
+    Session-wide buffer for performance samples when PERF_MONITOR=1 (None otherwise).
+    Each test's measurements are appended in memory; the JSON/CSV reports are
+    written once, off the event loop, when the session ends.
+    """
+    if not PERF_MONITOR_ENABLED:
+        yield None
         return
 
-    # Real monitor when enabled
-    monitor = PerformanceMonitorAsync(output_dir="test_artifacts/performance/auto_perf_reports")
-    yield monitor
-    # Save results after each test
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    monitor.save_metrics_to_json(f"auto_measured_pages_{timestamp}.json")
-    monitor.save_metrics_to_csv(f"auto_measured_pages_{timestamp}.csv")
+    report = PerformanceMonitorAsync(output_dir="test_artifacts/performance/auto_perf_reports")
+    yield report
+    if report.columns["url"]:
+        await report.flush("auto_measured_pages")
+
+@pytest.fixture(scope="session")
+async def perf_monitor():
+    """
+    Performance monitor fixture, created once per session.
+    - If PERF_MONITOR=1 → use real PerformanceMonitorAsync; samples go to perf_report.
+    - Otherwise → use DummyMonitor that returns minimal metrics and does nothing else.
+    Check perf_monitor.enabled to skip reporting work when it is the dummy.
+    Per-test isolation of metrics_history is handled by perf_monitor_per_test.
+    """
+    if not PERF_MONITOR_ENABLED:
+        return DummyMonitor()
+    return PerformanceMonitorAsync(output_dir="test_artifacts/performance/auto_perf_reports")
+
+@pytest.fixture(autouse=True)
+def perf_monitor_per_test(request):
+    """
+    Gives each test that uses the session-scoped perf_monitor a clean history,
+    and hands that test's samples to perf_report when it finishes.
+    """
+    if "perf_monitor" not in request.fixturenames:
+        yield
+        return
+
+    monitor = request.getfixturevalue("perf_monitor")
+    monitor.clear_metrics()
+    yield
+    perf_report = request.getfixturevalue("perf_report")
+    if perf_report is not None:
+        # Buffer results for the single end-of-session export
+        perf_report.extend(monitor)
 
 @pytest.fixture
 async def enhanced_page(page, perf_monitor):
-    """Enhanced page with performance monitoring and SPA detection"""
+    """
+    Enhanced page with performance monitoring and SPA detection.
+    Installs persistent PerformanceObservers once per document; SPA measurements
+    drain their buffer (window.__perfBuf) instead of re-arming observers.
+    """
     
-    # Inject combined script
-    combined_script = """
-        // Web Vitals tracking
-        window.webVitalsData = { lcp: null, fid: null, cls: null, fcp: null };
-        function observeLCP(){const o=new PerformanceObserver(list=>{const e=list.getEntries();const last=e[e.length-1];window.webVitalsData.lcp=last.startTime;});o.observe({entryTypes:['largest-contentful-paint']});}
-        function observeFCP(){const o=new PerformanceObserver(list=>{for(const e of list.getEntries()){if(e.name==='first-contentful-paint'){window.webVitalsData.fcp=e.startTime;}}});o.observe({entryTypes:['paint']});}
-        function observeCLS(){let v=0;const o=new PerformanceObserver(list=>{for(const e of list.getEntries()){if(!e.hadRecentInput){v+=e.value;}}window.webVitalsData.cls=v;});o.observe({entryTypes:['layout-shift']});}
-        function observeFID(){const o=new PerformanceObserver(list=>{for(const e of list.getEntries()){window.webVitalsData.fid=e.processingStart - e.startTime;}});o.observe({entryTypes:['first-input']});}
-        if (document.readyState === 'loading') {
-          document.addEventListener('DOMContentLoaded', () => {observeLCP(); observeFCP(); observeCLS(); observeFID();});
-        } else {observeLCP(); observeFCP(); observeCLS(); observeFID();}
+    web_vitals_script = """
+        // Web Vitals tracking: one long-lived observer per entry type. Every entry
+        // is also queued on window.__perfBuf so SPA measurements only drain it.
+        (function () {
+          if (window.__webVitalsInstalled) return;
+          window.__webVitalsInstalled = true;
+          window.webVitalsData = { lcp: null, fid: null, cls: null, fcp: null };
+          window.__perfBuf = [];
+          let clsValue = 0;
+          function onEntries(list) {
+            for (const e of list.getEntries()) {
+              window.__perfBuf.push(e);
+              if (e.entryType === 'largest-contentful-paint') { window.webVitalsData.lcp = e.startTime; }
+              else if (e.entryType === 'paint' && e.name === 'first-contentful-paint') { window.webVitalsData.fcp = e.startTime; }
+              else if (e.entryType === 'layout-shift' && !e.hadRecentInput) { clsValue += e.value; window.webVitalsData.cls = clsValue; }
+              else if (e.entryType === 'first-input') { window.webVitalsData.fid = e.processingStart - e.startTime; }
+            }
+          }
+          for (const type of ['largest-contentful-paint', 'paint', 'layout-shift', 'first-input', 'navigation']) {
+            try { new PerformanceObserver(onEntries).observe({ type, buffered: true }); } catch (e) {}
+          }
+        })();
+    """
 
+    route_change_script = """
         // SPA route change detection
         (function () {
           if (window.__routeChangeInstalled) return;
           window.__routeChangeInstalled = true;
           window.__routeChangeId = 0;
+          window.__routeChangeSignal = false;
           function notifyRouteChange() {
             window.__routeChangeId++;
+            // Consumed (reset) by wait_for_route_change
+            window.__routeChangeSignal = true;
             window.dispatchEvent(new Event('routechange'));
           }
           const _pushState = history.pushState;
@@ -175,23 +235,26 @@ async def enhanced_page(page, perf_monitor):
         })();
     """
     
-    await page.add_init_script(combined_script)
+    # Route-change tracking is always needed by measure_after_spa_route_change;
+    # observers and auto-measurement only when a real monitor is collecting
+    if not perf_monitor.enabled:
+        await page.add_init_script(route_change_script)
+        return page
+
+    await page.add_init_script(web_vitals_script + RESOURCE_TOTALS_JS + route_change_script)
     
     # Wrap page methods
     orig_goto = page.goto
     orig_reload = page.reload
 
+    # measure_current_page waits for networkidle and the vitals itself
     async def goto_with_metrics(url, *args, **kwargs):
         resp = await orig_goto(url, *args, **kwargs)
-        await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(500)
         await perf_monitor.measure_current_page(page, label=f"goto:{url}")
         return resp
 
     async def reload_with_metrics(*args, **kwargs):
         resp = await orig_reload(*args, **kwargs)
-        await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(500)
         await perf_monitor.measure_current_page(page, label=f"reload:{page.url}")
         return resp
 
@@ -17,9 +17,11 @@ Usage Example:
 
 Conventions:
     - Each test is marked as async and uses Playwright's async API.
-    - Test data for attacks is defined inline for clarity.
+    - Test data for attacks is defined inline for clarity; multi-payload tests
+      use module-level tuples with @pytest.mark.parametrize.
     - Comments explain the purpose and steps of each test.
     - Assertions check for expected error messages or safe behavior.
+    - Tests share one browser context (fresh page per test) since none log in.
 
 Todo: move to using the data.test_data file to populate the conditions, for now hardcoded
 
@@ -29,39 +31,54 @@ Date: [2025-07-27]
 """
 
 import pytest
+from playwright.async_api import expect
 from pages.login_page import LoginPage
 from utils.decorators.screenshot_decorator import screenshot_on_failure
 
+# None of these tests reach a logged-in state, so they can share one context
+pytestmark = pytest.mark.shared_context
+
+# ------------------------------------------------------------------------------
+# Helper: Invalid Email Error Assertions
+# ------------------------------------------------------------------------------
+
+async def assert_email_invalid_error(login_page):
+    """
+    Assert the invalid email error is shown with the expected text and icon.
+    Waits for the error to render, then reads text and icon in one round-trip.
+    """
+    await expect(login_page.error_message_email_invalid).to_be_visible()
+    error = await login_page.get_error_bundle(login_page.error_message_email_invalid)
+    assert login_page.error_message_email_invalid_text == error["text"]
+    assert error["has_icon"]
+
+SQL_INJECTION_EMAIL_PAYLOADS = (
+    "admin'--",
+    "' OR '1'='1",
+    "' OR 1=1--",
+    "'; DROP TABLE users;--",
+    "' UNION SELECT * FROM users--",
+    "' OR 'x'='x",
+)
+
 # ------------------------------------------------------------------------------
 # Test: SQL Injection in Email Field
 # ------------------------------------------------------------------------------
 
 @screenshot_on_failure
 @pytest.mark.login
+@pytest.mark.parametrize("email_payload", SQL_INJECTION_EMAIL_PAYLOADS)
 @pytest.mark.asyncio
-async def test_login_comprehensive_email_sql_injection(app):
+async def test_login_comprehensive_email_sql_injection(app, email_payload):
     """
     Attempt to login using various SQL injection payloads in the email field.
+    Each payload is its own test item so pytest-xdist can spread them across workers.
     Verifies that the login form is not vulnerable and displays the correct error.
     """
-    injection_payloads = [
-        "admin'--",
-        "' OR '1'='1",
-        "' OR 1=1--",
-        "'; DROP TABLE users;--",
-        "' UNION SELECT * FROM users--",
-        "' OR 'x'='x"
-    ]
-    for email_payload in injection_payloads:
-        await app.login_page.load_login_direct()
-        await app.login_page.enter_email(email_payload)
-        await app.login_page.click_continue()
-        # Assert that the invalid email error message is visible
-        assert await app.login_page.error_message_email_invalid.is_visible()
-        expected_message = app.login_page.error_message_email_invalid_text
-        actual_message = await app.login_page.get_error_message_email_invalid_text()
-        assert expected_message == actual_message
-        assert await app.login_page.has_email_invalid_error_icon()
+    await app.login_page.load_login_direct_fast()
+    await app.login_page.enter_email(email_payload)
+    await app.login_page.click_continue()
+    await assert_email_invalid_error(app.login_page)
 
 # ------------------------------------------------------------------------------
 # (Commented Out) Test: SQL Injection in Password Field
@@ -113,12 +130,16 @@ async def test_login_xss_email_field(page):
     Verifies that the script is not rendered in the page content.
     """
     login_page = LoginPage(page)
-    await login_page.load_login_direct()
+    await login_page.load_login_direct_fast()
     # Attempt to inject a script tag
     await login_page.enter_email("<script>alert('xss')</script>")
     await login_page.click_continue()
-    # Assert that the script tag is not present in the page content
-    assert "<script>alert('xss')</script>" not in await page.content()
+    # Assert that the script tag was not rendered into the DOM (checked in-page,
+    # rather than serializing the whole document back with page.content())
+    assert await page.evaluate(
+        "(s) => !document.documentElement.innerHTML.includes(s)",
+        "<script>alert('xss')</script>",
+    )
 
 # ------------------------------------------------------------------------------
 # Test: HTML Injection in Email Field
@@ -133,11 +154,14 @@ async def test_login_html_injection_email_field(page):
     Verifies that the HTML is not rendered in the page content.
     """
     login_page = LoginPage(page)
-    await login_page.load_login_direct()
+    await login_page.load_login_direct_fast()
     await login_page.enter_email("<b>bold@domain.com</b>")
     await login_page.click_continue()
-    # Assert that the HTML tag is not present in the page content
-    assert "<b>bold@domain.com</b>" not in await page.content()
+    # Assert that the HTML tag was not rendered into the DOM
+    assert await page.evaluate(
+        "(s) => !document.documentElement.innerHTML.includes(s)",
+        "<b>bold@domain.com</b>",
+    )
 
 # ------------------------------------------------------------------------------
 # Test: Command Injection in Email Field
@@ -151,14 +175,19 @@ async def test_login_command_injection_password_field(app):
     Attempt to inject a command in the email field to test for command injection.
     Verifies that the login form handles the input safely and shows an error.
     """
-    await app.login_page.load_login_direct()
+    await app.login_page.load_login_direct_fast()
     await app.login_page.enter_email("valid; ls;")
     await app.login_page.click_continue()
-    assert await app.login_page.error_message_email_invalid.is_visible()
-    expected_message = app.login_page.error_message_email_invalid_text
-    actual_message = await app.login_page.get_error_message_email_invalid_text()
-    assert expected_message == actual_message
-    assert await app.login_page.has_email_invalid_error_icon()
+    await assert_email_invalid_error(app.login_page)
+
+PATH_TRAVERSAL_EMAIL_PAYLOADS = (
+    "../../../etc/passwd",
+    "..\\..\\..\\windows\\system32\\drivers\\etc\\hosts",
+    "%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd",
+    "%252e%252e%252f",
+    "..%c0%af..%c0%af..%c0%afetc%c0%afpasswd",
+    "../../../etc/passwd%00",
+)
 
 # ------------------------------------------------------------------------------
 # Test: Path Traversal in Email Field
@@ -166,30 +195,18 @@ async def test_login_command_injection_password_field(app):
 
 @screenshot_on_failure
 @pytest.mark.login
+@pytest.mark.parametrize("email_payload", PATH_TRAVERSAL_EMAIL_PAYLOADS)
 @pytest.mark.asyncio
-async def test_login_comprehensive_email_path_traversal(app):
+async def test_login_comprehensive_email_path_traversal(app, email_payload):
     """
     Attempt to login using various Traversal payloads in the email field.
+    Each payload is its own test item so pytest-xdist can spread them across workers.
     Verifies that the login form is not vulnerable and displays the correct error.
     """
-    injection_payloads = [
-        "../../../etc/passwd",
-        "..\\..\\..\\windows\\system32\\drivers\\etc\\hosts",
-        "%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd",
-        "%252e%252e%252f",
-        "..%c0%af..%c0%af..%c0%afetc%c0%afpasswd",
-        "../../../etc/passwd%00"
-    ]
-    for email_payload in injection_payloads:
-        await app.login_page.load_login_direct()
-        await app.login_page.enter_email(email_payload)
-        await app.login_page.click_continue()
-        # Assert that the invalid email error message is visible
-        assert await app.login_page.error_message_email_invalid.is_visible()
-        expected_message = app.login_page.error_message_email_invalid_text
-        actual_message = await app.login_page.get_error_message_email_invalid_text()
-        assert expected_message == actual_message
-        assert await app.login_page.has_email_invalid_error_icon()
+    await app.login_page.load_login_direct_fast()
+    await app.login_page.enter_email(email_payload)
+    await app.login_page.click_continue()
+    await assert_email_invalid_error(app.login_page)
 
 
 # ------------------------------------------------------------------------------
@@ -203,16 +220,23 @@ async def test_login_brute_force(app):
     """
     Attempt multiple rapid login attempts with incorrect passwords to simulate
     brute force attacks. Verifies that the application consistently shows the
-    correct error message and does not allow access.
+    correct error message and does not allow access. Stops early if the account
+    gets locked out.
     """
-    await app.login_page.load_login_direct()
+    await app.login_page.load_login_direct_fast()
     await app.login_page.enter_email("user@domain.com")
     await app.login_page.click_continue()
     for i in range(5):
-        await app.login_page.enter_password(f"wrongpassword{i}")
-        await app.login_page.click_continue()
-        assert await app.login_page.error_message_email_or_password_incorrect.is_visible()
+        # Fill + submit in one round-trip; this test covers error handling, not typing
+        await app.login_page.submit_password_fast(f"wrongpassword{i}")
+        # Wait for either the error or a lockout, then read text and icon in one round-trip
+        await expect(
+            app.login_page.error_message_email_or_password_incorrect.or_(app.login_page.blocked_account_alert)
+        ).to_be_visible()
+        # A lockout is the defence being probed for; stop instead of paying for more attempts
+        if await app.login_page.is_account_blocked():
+            break
+        error = await app.login_page.get_error_bundle(app.login_page.error_message_email_or_password_incorrect)
         expected_message = app.login_page.error_message_email_incorrect_text
-        actual_message = await app.login_page.get_error_message_email_incorrect_text()
-        assert expected_message == actual_message
-        assert await app.login_page.has_email_or_password_incorrect_error_icon()
\ No newline at end of file
+        assert expected_message == error["text"]
+        assert error["has_icon"]
\ No newline at end of file
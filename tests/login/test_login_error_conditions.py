@@ -33,6 +33,10 @@ import pytest
 from data.personas import PERSONAS
 from utils.decorators.screenshot_decorator import screenshot_on_failure
 
+# Default persona credentials, resolved once at import rather than per test
+USER_EMAIL = PERSONAS["user"]["email"]
+USER_PASSWORD = PERSONAS["user"]["password"]
+
 # ------------------------------------------------------------------------------
 # Test: Valid Account with Invalid Password
 # ------------------------------------------------------------------------------
@@ -47,7 +51,7 @@ async def test_login_invalid_password(app):
     Verifies that the appropriate error message is displayed.
     """
     await app.login_page.load_login_direct()
-    await app.login_page.enter_email(PERSONAS["user"]["email"])
+    await app.login_page.enter_email(USER_EMAIL)
     await app.login_page.click_continue()
     await app.login_page.enter_password("wrongpassword")
     await app.login_page.click_continue()
@@ -96,7 +100,7 @@ async def test_account_blocked_after_multiple_attempts(app):
     # Simulate multiple failed login attempts (assuming 10+ attempts trigger the block) #hrmmmmm blocked myslef but this 10 doesnt seem to work, need to fix?
     for _ in range(11):
         await app.login_page.load_login_direct()
-        await app.login_page.enter_email(PERSONAS["user"]["email"])
+        await app.login_page.enter_email(USER_EMAIL)
         await app.login_page.click_continue()
         await app.login_page.enter_password("wrongpassword")
         await app.login_page.click_continue()
@@ -211,9 +215,9 @@ async def test_login_edit_invalid_account(app):
     assert await app.login_page.password_textbox.is_visible()
     # Edit the email to a valid account
     await app.login_page.edit_email_link.click()
-    await app.login_page.enter_email(PERSONAS["user"]["email"])
+    await app.login_page.enter_email(USER_EMAIL)
     await app.login_page.click_continue()
-    await app.login_page.enter_password(PERSONAS["user"]["password"])
+    await app.login_page.enter_password(USER_PASSWORD)
     await app.login_page.click_continue()
     await app.dashboard_page.verify_user_profile_info()
 
@@ -276,7 +280,7 @@ async def test_password_shown_when_button_clicked(app):
     and can be revealed when the show password button is clicked.
     """
     await app.login_page.load_login_direct()
-    await app.login_page.enter_email(PERSONAS["user"]["email"])
+    await app.login_page.enter_email(USER_EMAIL)
     await app.login_page.click_continue()
     await app.login_page.enter_password("supersecret")
 
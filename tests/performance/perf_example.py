@@ -20,7 +20,8 @@ from utils.performance_monitor import (
     measure_after_spa_route_change,
 )
 
-pytestmark = pytest.mark.asyncio
+# measure_many drives the session-scoped shared_browser, so these tests must run on its loop
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
 class TestWithPerformanceMonitoring:
@@ -53,29 +54,33 @@ class TestWithPerformanceMonitoring:
         search_input = page.locator("input[name='search']")
         if await search_input.count() > 0:
             await search_input.fill("test query")
-            await search_input.press("Enter")
 
             # If search results are SPA-rendered, this captures it. Otherwise, it's still safe.
             metrics = await measure_after_spa_route_change(
-                page, perf_monitor, label="search_results", settle_ms=600, timeout=5000
+                page, perf_monitor, label="search_results", settle_ms=600, timeout=5000,
+                action=lambda: search_input.press("Enter")
             )
 
             assert metrics.page_load_time is None or metrics.page_load_time < 2000, \
                 f"Search too slow: {metrics.page_load_time}ms"
 
-    async def test_multiple_pages_performance(self, page, perf_monitor):
-        """Test performance across multiple pages"""
+    async def test_multiple_pages_performance(self, shared_browser, perf_monitor):
+        """
+        Test performance across multiple pages.
+        The URLs are independent, so measure_many measures them concurrently, each
+        in its own context from the shared browser (same session loop as this test);
+        perf_monitor collects all results.
+        """
         test_urls = [
             "https://example.com",
             "https://example.com/about",
             "https://example.com/contact",
         ]
 
-        for url in test_urls:
-            async with PerformanceTestAsync(perf_monitor, url, print_summary=False) as perf_test:
-                metrics = await perf_test.measure(page)
-                assert metrics.page_load_time is None or metrics.page_load_time < 5000, \
-                    f"Page {url} load too slow: {metrics.page_load_time}ms"
+        results = await perf_monitor.measure_many(shared_browser, test_urls)
+        for url, metrics in zip(test_urls, results):
+            assert metrics.page_load_time is None or metrics.page_load_time < 5000, \
+                f"Page {url} load too slow: {metrics.page_load_time}ms"
 
     async def test_performance_with_interactions(self, page, perf_monitor):
         """Test performance during user interactions"""
@@ -99,10 +104,10 @@ class TestWithPerformanceMonitoring:
                     continue
 
                 # Click and then measure the resulting page (full nav or SPA)
-                await link.click()
                 # Try SPA measure first; if no SPA change detected, still measure current state
                 metrics = await measure_after_spa_route_change(
-                    page, perf_monitor, label=f"nav:{href}", settle_ms=600, timeout=4000
+                    page, perf_monitor, label=f"nav:{href}", settle_ms=600, timeout=4000,
+                    action=link.click
                 )
 
                 # As a fallback for full navigations, ensure load state and measure again if needed
@@ -38,11 +38,15 @@ Date: [2025-08-18]
 ===============================================================================
 """
 
+import numpy as np
 import pytest
 from utils.performance_monitor import measure_after_spa_route_change
 from utils.decorators.screenshot_decorator import screenshot_on_failure  # Add this import if the decorator is defined in utils/screenshot.py
 from data.personas import PERSONAS
 
+# Bound once at import: (email, password) for the default persona
+USER_CREDS = (PERSONAS["user"]["email"], PERSONAS["user"]["password"])
+
 @screenshot_on_failure
 @pytest.mark.performance
 @pytest.mark.asyncio
@@ -58,18 +62,15 @@ async def test_login_direct_valid_credentials_then_logout_performance(app, enhan
     # All page.goto calls are now auto-measured!
     await app.login_page.load_login_direct()  # Auto-measured
     
-    await app.login_page.fill_email_and_password_submit(
-        PERSONAS["user"]["email"], 
-        PERSONAS["user"]["password"]
-    )
+    await app.login_page.fill_email_and_password_submit(*USER_CREDS)
     # Dashboard load after login is auto-measured
     
     await app.dashboard_page.verify_user_profile_info()
     
-    # If clicking user avatar triggers SPA navigation, measure it:
-    await app.dashboard_page.click_user_avatar()
-    # If this is a SPA route change (dropdown/modal), measure it:
-    await measure_after_spa_route_change(page, perf_monitor, label="user_menu_opened")
+    # If clicking user avatar triggers a SPA route change (dropdown/modal), measure it:
+    await measure_after_spa_route_change(
+        page, perf_monitor, label="user_menu_opened", action=app.dashboard_page.click_user_avatar
+    )
     
     await app.dashboard_page.click_logout()
     # Logout navigation is auto-measured
@@ -77,14 +78,18 @@ async def test_login_direct_valid_credentials_then_logout_performance(app, enhan
     await app.login_page.load_home()  # Auto-measured
     await app.login_page.email_textbox.is_visible()
 
-    # Print summary of all measurements
-    print(f"\n📊 Total pages measured: {len(perf_monitor.metrics_history)}")
-    
-    avg_metrics = perf_monitor.get_average_metrics()
-    if avg_metrics and avg_metrics.get('page_load_time'):
-        print(f"📈 Average page load time: {avg_metrics['page_load_time']:.2f} ms")
-    
-    # Performance assertions across the entire flow
-    for metric in perf_monitor.metrics_history:
-        if metric.page_load_time:
-            assert metric.page_load_time < 5000, f"Page {metric.url} too slow: {metric.page_load_time}ms"
\ No newline at end of file
+    # Reporting and budgets only mean something when a real monitor is collecting
+    if perf_monitor.enabled:
+        # Print summary of all measurements
+        print(f"\n📊 Total pages measured: {len(perf_monitor.columns['url'])}")
+
+        avg_metrics = perf_monitor.get_average_metrics()
+        if avg_metrics and avg_metrics.get('page_load_time'):
+            print(f"📈 Average page load time: {avg_metrics['page_load_time']:.2f} ms")
+
+        # Performance assertions across the entire flow: assert once on the slowest page
+        load_times = np.array(perf_monitor.columns["page_load_time"], dtype=np.float64)  # None -> NaN
+        if np.any(load_times > 0):
+            slowest = int(np.nanargmax(load_times))
+            assert load_times[slowest] < 5000, \
+                f"Page {perf_monitor.columns['url'][slowest]} too slow: {load_times[slowest]}ms"
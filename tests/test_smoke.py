@@ -1,8 +1,11 @@
 """Smoke test to verify framework running after Chromium broke"""
+import re
 import pytest
+from playwright.async_api import expect
 
 @pytest.mark.only
 @pytest.mark.asyncio
 async def test_hudl_homepage(page):
-    await page.goto("https://www.hudl.com/")
-    assert "Hudl" in await page.title()
\ No newline at end of file
+    # The title assertion auto-waits, so there is no need to wait for subresources
+    await page.goto("https://www.hudl.com/", wait_until="commit")
+    await expect(page).to_have_title(re.compile("Hudl"))
@@ -11,37 +11,217 @@ Features:
     - Async context capture including screenshots and DOM snapshot
     - Robust prompt building for AI analysis
     - Querying Ollama with retries and error handling
-    - Parsing Ollama JSON responses with multiple fallback strategies
+    - Async queries so all final failures are healed concurrently at session end
+    - Several failures packed into one prompt to share the instruction prefill
+    - Memory + disk cache of analyses keyed on the failure signature
+    - Server-side JSON mode (response schema via `format`) so replies parse directly
+    - Streamed generation that stops as soon as the JSON object is complete
+    - Parsing Ollama JSON responses (brace scan + orjson, then lenient JSON5) with fallbacks
     - Saving detailed markdown reports and healed test code
     - Thread-safe context storage for parallel test runs
 
 Environment Variables:
-    OLLAMA_MODEL: Ollama model to use (default: llama3.1:8b)
+    OLLAMA_MODEL: Ollama model to use (default: llama3.1:8b, which Ollama serves as a
+        Q4_K_M quantization; pin it explicitly with e.g. llama3.1:8b-instruct-q4_K_M)
+    OLLAMA_KEEP_ALIVE: How long Ollama keeps the model loaded after a request (default: 30m)
+    AI_HEALING_VISION: Send failure screenshots to the model (true|false, default:
+        detected from the model name, e.g. llava, llama3.2-vision)
     AI_HEALING_ENABLED: Enable AI healing (true|false, default: false)
     AI_HEALING_CONFIDENCE: Confidence threshold for healed tests (default: 0.7)
     OLLAMA_HOST: Ollama server URL (default: http://localhost:11434)
     OLLAMA_TEMPERATURE: Temperature setting for Ollama model (default: 0.1)
-    AI_HEALING_CONTEXT_WINDOW: Max number of DOM characters to include (default: 5000)
+    AI_HEALING_CONTEXT_WINDOW: Max number of DOM characters to include
+        (default: derived from the model's context length, see dom_budget)
+    AI_HEALING_NUM_CTX_MAX: Upper bound on the num_ctx requested from Ollama (default: 32768)
+    AI_HEALING_BATCH (or AI_HEALING_BATCH_SIZE): Max failures packed into one healing prompt (default: 4)
+    AI_HEALING_QUEUE_MAX: Max failure contexts held for healing; oldest dropped (default: 256)
+    AI_HEALING_CONCURRENCY: Max healing requests in flight at once (default: 2)
+    AI_HEALING_CACHE_DIR: Where cached analyses are stored
+        (default: test_artifacts/ai/ai_healing_reports/.cache)
+    AI_HEALING_CACHE_TTL_HOURS: Age after which a cached analysis is discarded (default: 168)
+    OLLAMA_NUM_PARALLEL: (Ollama server setting) How many healing requests the
+        server processes concurrently; raise it to benefit from batched healing
 
 Author: PMAC
 Date: [2025-07-29]
 ===============================================================================
 """
 
-import json
+import asyncio
+import base64
+import functools
+import json5
+import orjson
 import inspect
+import logging
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from datetime import datetime
 import subprocess
 import time
+import queue
+import re
 import shutil
-import ollama
-from config.artifact_paths import AI_HEALING_REPORT_DIR, SCREENSHOT_DIR
+import string
+import textwrap
+import traceback
+from config.artifact_paths import AI_HEALING_REPORT_DIR, AI_HEALING_CACHE_DIR, SCREENSHOT_DIR
+from utils.ai_healing_cache import HealingResponseCache
 
 from utils.debug import debug_print
-import re
+
+# Per-failure progress goes through logging so it costs a level check when quiet;
+# the level comes from pytest's logging config (log_level in pytest.ini, --log-level)
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------------------
+# Precompiled regular expressions (response parsing and DOM cleanup)
+# ------------------------------------------------------------------------------
+
+_RE_STYLE_TAG = re.compile(r'<style.*?>.*?</style>', re.DOTALL | re.IGNORECASE)
+_RE_LEAD = re.compile(r'^[^{]*')
+_RE_TRAIL = re.compile(r'[^}]*$')
+_RE_ANALYSIS = re.compile(r'"analysis"\s*:\s*"([^"]*)"')
+_RE_ROOT_CAUSE = re.compile(r'"root_cause"\s*:\s*"([^"]*)"')
+_RE_CONFIDENCE = re.compile(r'"confidence"\s*:\s*([0-9.]+)')
+
+# Model name fragments of vision-capable Ollama models (see AI_HEALING_VISION)
+_VISION_MODEL_TAGS = (
+    "llava", "bakllava", "moondream", "vision", "qwen2-vl", "qwen2.5vl", "minicpm-v", "gemma3",
+)
+
+# ------------------------------------------------------------------------------
+# Response schemas (passed as Ollama's `format` so the server constrains output to JSON)
+# ------------------------------------------------------------------------------
+
+_HEALING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analysis": {"type": "string"},
+        "root_cause": {"type": "string"},
+        "confidence": {"type": "number"},
+        "suggested_fix": {"type": "string"},
+        "updated_test_code": {"type": "string"},
+        "recommendations": {"type": "string"},
+    },
+    "required": ["analysis", "confidence"],
+}
+
+_BATCH_HEALING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {"type": "array", "items": {
+            **_HEALING_SCHEMA,
+            "properties": {"index": {"type": "integer"}, **_HEALING_SCHEMA["properties"]},
+        }},
+    },
+    "required": ["results"],
+}
+
+# Test source per code object, so repeated (e.g. parametrized) failures skip the file read
+_source_cache = {}
+
+# ------------------------------------------------------------------------------
+# Class: _BraceScanner
+# ------------------------------------------------------------------------------
+
+class _BraceScanner:
+    """
+    Incremental, string- and escape-aware brace matcher. Text can be fed in
+    pieces (e.g. streamed tokens); feed() reports when the first top-level
+    {...} object has closed, and start/end give its offsets in the fed text.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.start = None
+        self.end = None
+        self._pos = 0
+
+    def feed(self, text):
+        """
+        Scan the next piece of text.
+
+        Args:
+            text (str): Text following everything fed so far
+
+        Returns:
+            bool: True once the first top-level object is complete
+        """
+        if self.end is not None:
+            return True
+        for ch in text:
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '{':
+                if self.start is None:
+                    self.start = self._pos
+                self.depth += 1
+            elif self.start is None:
+                pass  # Prose before the object; quotes here do not start a JSON string
+            elif ch == '"':
+                self.in_string = True
+            elif ch == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = self._pos + 1
+                    return True
+            self._pos += 1
+        return False
+
+# ------------------------------------------------------------------------------
+# Function: _extract_json_object
+# ------------------------------------------------------------------------------
+
+def _extract_json_object(text):
+    """
+    Return the first balanced {...} object in text, or None.
+
+    A single linear pass (see _BraceScanner), so there is no regex
+    backtracking on long replies.
+
+    Args:
+        text (str): Raw model response
+
+    Returns:
+        str or None: The object substring, or None if no balanced object exists
+    """
+    scanner = _BraceScanner()
+    return text[scanner.start:scanner.end] if scanner.feed(text) else None
+
+# ------------------------------------------------------------------------------
+# DOM skeleton script (run in the page; n = character budget)
+# ------------------------------------------------------------------------------
+
+# Works on a clone of <body> so the live page is untouched. Drops nodes that only
+# bloat the LLM context (scripts, styles, SVG, templates, comments), inline data:
+# URIs and style attributes, and collapses whitespace, so the same character budget
+# carries far more of the structure selectors actually target.
+_DOM_SKELETON_JS = """(n) => {
+    const root = (document.body || document.documentElement).cloneNode(true);
+    root.querySelectorAll('script, style, noscript, svg, template, link, meta, iframe')
+        .forEach(e => e.remove());
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_COMMENT);
+    const comments = [];
+    while (walker.nextNode()) comments.push(walker.currentNode);
+    comments.forEach(c => c.remove());
+    root.querySelectorAll('*').forEach(e => {
+        e.removeAttribute('style');
+        for (const attr of Array.from(e.attributes)) {
+            if (attr.value.startsWith('data:')) e.setAttribute(attr.name, 'data:...');
+        }
+    });
+    return root.outerHTML.replace(/\\s+/g, ' ').replace(/> </g, '><').slice(0, n + 1);
+}"""
 
 # ------------------------------------------------------------------------------
 # Function: strip_style_tags
@@ -57,7 +237,211 @@ def strip_style_tags(html):
     Returns:
         str: HTML string with all <style> tags and their contents removed.
     """
-    return re.sub(r'<style.*?>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    return _RE_STYLE_TAG.sub('', html)
+
+# ------------------------------------------------------------------------------
+# Prompt and report templates (parsed once; only the variable parts are substituted)
+# ------------------------------------------------------------------------------
+
+_SECTION_TMPL = string.Template(textwrap.dedent("""
+    ${heading}
+    - **Test Name**: ${test_name}
+    - **Error Type**: ${error_type}
+    - **URL**: ${url}
+    - **Page Title**: ${title}
+
+    ### Error Message:
+    ```
+    ${error_message}
+    ```
+
+    ### Original Test Code:
+    ```python
+    ${original_test_code}
+    ```
+
+    ### Test Documentation:
+    ${test_docstring}
+
+    ### DOM Context (truncated):
+    ```html
+    ${dom}
+    ```
+    """))
+
+_PLAYWRIGHT_FOCUS = textwrap.dedent("""
+    Focus on common Playwright issues like:
+    - Element not found/changed selectors
+    - Timing issues and race conditions
+    - Network/loading problems
+    - State management issues
+    - Flaky test patterns
+    """)
+
+_PROMPT_TMPL = string.Template(textwrap.dedent("""
+    You are an expert Quality Assurance Engineer and test automation specialist.
+
+    A Playwright Python test has failed and needs analysis for potential auto-healing.
+    ${section}
+    ## Your Task:
+    Analyze this test failure and provide:
+
+    1. **Root Cause Analysis**: What exactly caused this test to fail?
+    2. **Confidence Score**: Rate your confidence in the analysis (0.0 to 1.0)
+    3. **Suggested Fix**: Specific code changes or approach to fix the test
+    4. **Updated Test Code**: Always provide a corrected version of the test code that fixes the failure. Return only the updated test function code in Python.
+    5. **Recommendations**: Additional suggestions for test stability
+
+    IMPORTANT: Respond ONLY with a valid JSON object, no markdown formatting or extra text.
+
+    {
+        "analysis": "Detailed analysis of what went wrong",
+        "root_cause": "Specific root cause identified",
+        "confidence": 0.85,
+        "suggested_fix": "Specific fix recommendation",
+        "updated_test_code": "Complete fixed test code (if confident)",
+        "recommendations": "Additional recommendations for improvement"
+    }
+    """) + _PLAYWRIGHT_FOCUS)
+
+_BATCH_PROMPT_TMPL = string.Template(textwrap.dedent("""
+    You are an expert Quality Assurance Engineer and test automation specialist.
+
+    ${count} Playwright Python tests have failed and need analysis for potential auto-healing.
+    Any screenshots are attached in failure order.
+    ${sections}
+    ## Your Task:
+    Analyze EACH failure independently and provide, per failure:
+
+    1. **Root Cause Analysis**: What exactly caused this test to fail?
+    2. **Confidence Score**: Rate your confidence in the analysis (0.0 to 1.0)
+    3. **Suggested Fix**: Specific code changes or approach to fix the test
+    4. **Updated Test Code**: Always provide a corrected version of the test code that fixes the failure. Return only the updated test function code in Python.
+    5. **Recommendations**: Additional suggestions for test stability
+
+    IMPORTANT: Respond ONLY with a valid JSON object, no markdown formatting or extra text.
+    "results" must contain exactly ${count} entries, in the same order as the failures above,
+    each with "index" set to the failure's number.
+
+    {
+        "results": [
+            {
+                "index": 1,
+                "analysis": "Detailed analysis of what went wrong",
+                "root_cause": "Specific root cause identified",
+                "confidence": 0.85,
+                "suggested_fix": "Specific fix recommendation",
+                "updated_test_code": "Complete fixed test code (if confident)",
+                "recommendations": "Additional recommendations for improvement"
+            }
+        ]
+    }
+    """) + _PLAYWRIGHT_FOCUS)
+
+_REPORT_TMPL = string.Template("""# 🧠 Ollama AI Healing Report
+
+## Test Information
+- **Test Name**: `${test_name}`
+- **Timestamp**: `${timestamp}`
+- **Model Used**: `${model}`
+- **URL**: `${url}`
+- **Error Type**: `${error_type}`
+
+## Error Details
+```
+${error_message}
+```
+
+## Ollama Analysis
+```
+${analysis}
+```
+
+## Root Cause
+```
+${root_cause}
+```
+
+## Suggested Fix
+```
+${suggested_fix}
+```
+
+## Updated Code
+```
+${updated_test_code}
+```
+
+## Confidence Level
+**${confidence}**
+
+## Recommendations
+```
+${recommendations}
+```
+
+## Raw Ollama Response
+<details>
+<summary>Click to expand raw response</summary>
+
+```
+${raw_ollama_response}
+```
+</details>
+
+---
+*Generated by Ollama AI Healing System*
+""")
+
+# ------------------------------------------------------------------------------
+# Function: build_http_session
+# ------------------------------------------------------------------------------
+
+def build_http_session():
+    """
+    Build a keep-alive requests.Session with a small connection pool for the
+    Ollama health, pull and warmup calls, so polling loops reuse one TCP
+    connection instead of opening a new one per request.
+
+    Returns:
+        requests.Session: Session with an HTTPAdapter mounted for http and https
+    """
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# ------------------------------------------------------------------------------
+# Function: get_model_context_length
+# ------------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def get_model_context_length(host, model, default=8192):
+    """
+    Read the model's context length (tokens) from Ollama's show endpoint.
+    Cached per (host, model), so it is asked at most once per session.
+
+    Args:
+        host (str): Ollama host URL
+        model (str): Model name
+        default (int): Value used when the server or field is unavailable
+
+    Returns:
+        int: Context length in tokens
+    """
+    try:
+        import ollama
+        info = ollama.Client(host=host).show(model)
+        model_info = getattr(info, "modelinfo", None) or info.get("model_info") or {}
+        for key, value in model_info.items():
+            # e.g. "llama.context_length", "phi3.context_length"
+            if key.endswith(".context_length"):
+                return int(value)
+    except Exception as e:
+        debug_print(f"🤖 Could not read context length for {model}: {e}")
+    return default
 
 # ------------------------------------------------------------------------------
 # Class: OllamaAIHealingService
@@ -76,8 +460,36 @@ class OllamaAIHealingService:
         self.confidence_threshold = float(os.getenv("AI_HEALING_CONFIDENCE", "0.7"))
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
         self.temperature = float(os.getenv("OLLAMA_TEMPERATURE", "0.1"))
-        self.context_window = int(os.getenv("AI_HEALING_CONTEXT_WINDOW", "5000"))
-        self.client = ollama.Client(host=self.ollama_host)
+        # Text-only models ignore images, so only ship screenshots to vision models
+        vision = os.getenv("AI_HEALING_VISION", "").lower()
+        self.vision_capable = (
+            vision == "true" if vision in ("true", "false")
+            else any(tag in self.model for tag in _VISION_MODEL_TAGS)
+        )
+        self._vision_warned = False
+        # Keep the model resident between bursts of failures instead of reloading it
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        # An explicit AI_HEALING_CONTEXT_WINDOW wins; otherwise the DOM budget follows the model
+        self._context_window_override = os.getenv("AI_HEALING_CONTEXT_WINDOW")
+        self.context_window = int(self._context_window_override or "5000")
+        self.num_ctx_max = int(os.getenv("AI_HEALING_NUM_CTX_MAX", "32768"))
+        self.batch_size = int(os.getenv("AI_HEALING_BATCH") or os.getenv("AI_HEALING_BATCH_SIZE") or "4")
+        self.concurrency = max(1, int(os.getenv("AI_HEALING_CONCURRENCY", "2")))
+        self._query_slots = None  # (event loop, Semaphore), see _get_query_slots
+        # Ollama clients are created on first use (see client/aclient), so the SDK
+        # is never imported when AI healing is disabled
+        self._client = None
+        self._aclient = None
+        # Failure contexts awaiting healing; bounded and safe to fill from several threads
+        self._pending_contexts = queue.Queue(maxsize=int(os.getenv("AI_HEALING_QUEUE_MAX", "256")))
+        # Near-deterministic sampling makes repeat answers reusable; only cache then
+        self.cache = HealingResponseCache(
+            AI_HEALING_CACHE_DIR, max_age=float(os.getenv("AI_HEALING_CACHE_TTL_HOURS", "168")) * 3600
+        )
+        self.cache_enabled = self.temperature <= 0.2
+        # Pooled HTTP session for health/pull/warmup calls (replaceable in tests)
+        self.http = build_http_session()
+        self._gen_url = f"{self.ollama_host}/api/generate"
 
     # async def capture_failure_context(self, page, error, test_name, test_function):
     #     """
@@ -93,6 +505,103 @@ class OllamaAIHealingService:
     #     )
     #     return context, screenshot_path
 
+    @property
+    def client(self):
+        """Sync ollama.Client, created (and the SDK imported) on first use."""
+        if self._client is None:
+            import ollama
+            self._client = ollama.Client(host=self.ollama_host)
+        return self._client
+
+    @property
+    def aclient(self):
+        """ollama.AsyncClient, created (and the SDK imported) on first use."""
+        if self._aclient is None:
+            import ollama
+            self._aclient = ollama.AsyncClient(host=self.ollama_host)
+        return self._aclient
+
+    @property
+    def num_ctx(self):
+        """
+        Context size (tokens) to request from Ollama: the model's own context
+        length, capped at AI_HEALING_NUM_CTX_MAX to keep the KV cache affordable.
+        Only queried when first needed, so importing this module never contacts Ollama.
+        """
+        return min(get_model_context_length(self.ollama_host, self.model), self.num_ctx_max)
+
+    @property
+    def dom_budget(self):
+        """
+        Max DOM characters to include in a prompt: AI_HEALING_CONTEXT_WINDOW when set,
+        otherwise ~4 characters per token of num_ctx minus room for the rest of the prompt.
+        """
+        if self._context_window_override:
+            return self.context_window
+        return max(1024, self.num_ctx * 4 - 3000)
+
+    @property
+    def code_budget(self):
+        """
+        Max test-source characters to include per failure: about a third of the
+        num_ctx character budget, so a large test module cannot crowd out the DOM.
+        """
+        return max(2048, self.num_ctx * 4 // 3)
+
+    @staticmethod
+    def _trim_test_code(code, test_name, budget):
+        """
+        Fit test source into budget characters. The full module is kept when it
+        fits; otherwise the window starts at the failing test's def (if found).
+        """
+        if len(code) <= budget:
+            return code
+        func_name = test_name.split("[", 1)[0]
+        start = max(code.find(f"def {func_name}("), 0)
+        if start:
+            # Back up to the blank line above, to keep decorators and the async keyword
+            blank = code.rfind("\n\n", 0, start)
+            start = blank + 2 if blank >= 0 else 0
+        return code[start:start + budget] + "\n# ... (truncated)"
+
+    def queue_failure(self, test_key, payload):
+        """
+        Queue a captured failure for healing. When the queue is full the oldest
+        entry is dropped so memory stays bounded.
+
+        Args:
+            test_key (str): Pytest node id of the failed test
+            payload (dict): test_name, context, original_test_code and screenshot_path
+
+        Returns:
+            None
+        """
+        while True:
+            try:
+                self._pending_contexts.put_nowait((test_key, payload))
+                return
+            except queue.Full:
+                try:
+                    dropped_key, _ = self._pending_contexts.get_nowait()
+                    logger.warning("🧠 AI healing queue full, dropping oldest context (%s)", dropped_key)
+                except queue.Empty:
+                    pass
+
+    def drain_pending(self):
+        """
+        Take every queued failure off the queue.
+
+        Returns:
+            dict: Latest payload per test key (a retried test keeps its last capture)
+        """
+        pending = {}
+        while True:
+            try:
+                test_key, payload = self._pending_contexts.get_nowait()
+            except queue.Empty:
+                return pending
+            pending[test_key] = payload
+
     async def capture_failure_context(self, page, error, test_name, test_function):
         """
         Capture all context needed for AI analysis including URL, title, screenshot, and DOM.
@@ -109,24 +618,53 @@ class OllamaAIHealingService:
             if page:
                 debug_print(f"[AI Healing] Page object is present for test '{test_name}'")
                 context["url"] = page.url  # <-- FIXED: no ()
-                context["title"] = await page.title()  # <-- Only title() is a coroutine
 
                 screenshot_dir = SCREENSHOT_DIR
                 screenshot_dir.mkdir(exist_ok=True)
                 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                screenshot_path = screenshot_dir / f"{test_name}_{timestamp}_ai_healing.png"
-                
-                await page.screenshot(path=str(screenshot_path))
-                context["screenshot_path"] = str(screenshot_path)
-                dom_content = await page.content()
-                #remove excess css since we want a smaller htl contxt to pass to the LLM
-                dom_content = strip_style_tags(dom_content)
-                context["dom"] = (
-                    dom_content[:self.context_window] + "..."
-                    if len(dom_content) > self.context_window
-                    else dom_content
+                # JPEG q60 is plenty for vision input and several times smaller than PNG
+                screenshot_path = screenshot_dir / f"{test_name}_{timestamp}_ai_healing.jpg"
+                dom_budget = self.dom_budget
+
+                # Title, screenshot and DOM are independent round-trips; issue them together.
+                # The DOM is skeletonized and truncated in the browser so only the
+                # first dom_budget characters cross CDP (see _DOM_SKELETON_JS).
+                # One extra character tells whether truncation happened.
+                title, screenshot, dom_content = await asyncio.gather(
+                    page.title(),
+                    # caret="initial" leaves the page's caret alone instead of hiding it via injected CSS
+                    page.screenshot(
+                        path=str(screenshot_path), type="jpeg", quality=60, full_page=False, caret="initial"
+                    ),
+                    page.evaluate(_DOM_SKELETON_JS, dom_budget),
+                    return_exceptions=True,
                 )
-                debug_print(f"[AI Healing] DOM captured: {len(context['dom'])} characters for test '{test_name}'")
+
+                # A failed piece is recorded in capture_error without losing the others
+                capture_errors = []
+                if isinstance(title, Exception):
+                    capture_errors.append(f"title: {title}")
+                else:
+                    context["title"] = title
+
+                if isinstance(screenshot, Exception):
+                    capture_errors.append(f"screenshot: {screenshot}")
+                    screenshot_path = None
+                else:
+                    context["screenshot_path"] = str(screenshot_path)
+
+                if isinstance(dom_content, Exception):
+                    capture_errors.append(f"dom: {dom_content}")
+                else:
+                    context["dom"] = (
+                        dom_content[:dom_budget] + "..."
+                        if len(dom_content) > dom_budget
+                        else dom_content
+                    )
+
+                if capture_errors:
+                    context["capture_error"] = "; ".join(capture_errors)
+                debug_print(f"[AI Healing] DOM captured: {len(context.get('dom', ''))} characters for test '{test_name}'")
             else:
                 debug_print(f"[AI Healing] No page object for test '{test_name}'")
         except Exception as e:
@@ -134,74 +672,105 @@ class OllamaAIHealingService:
             context["capture_error"] = str(e)
         return context, screenshot_path
 
-    def _build_healing_prompt(self, context, original_test_code):
+    def _build_single_section(self, context, original_test_code, idx=None):
         """
-        Build a comprehensive prompt for Ollama AI model based on test failure context.
+        Build the per-failure part of a healing prompt (test info, error, code, DOM).
 
         Args:
             context (dict): Captured failure context
             original_test_code (str): Source code of the original test
+            idx (int): Failure number when packed into a batch prompt (None for a single failure)
 
         Returns:
-            str: Formatted prompt string
+            str: Formatted prompt section
         """
-        prompt = f"""
-            You are an expert Quality Assurance Engineer and test automation specialist. 
+        heading = f"## Failure {idx}: {context['test_name']}" if idx is not None else "## Test Information:"
+        return _SECTION_TMPL.safe_substitute(
+            heading=heading,
+            test_name=context["test_name"],
+            error_type=context.get("error_type", "Unknown"),
+            url=context.get("url", "N/A"),
+            title=context.get("title", "N/A"),
+            error_message=context["error_message"],
+            original_test_code=self._trim_test_code(
+                original_test_code or "", context["test_name"], self.code_budget
+            ),
+            test_docstring=context.get("test_docstring", "No test docstring provided"),
+            dom=context.get("dom", "No DOM captured"),
+        )
 
-            A Playwright Python test has failed and needs analysis for potential auto-healing.
+    def _build_healing_prompt(self, context, original_test_code):
+        """
+        Build a comprehensive prompt for Ollama AI model based on test failure context.
 
-            ## Test Information:
-            - **Test Name**: {context['test_name']}
-            - **Error Type**: {context.get('error_type', 'Unknown')}
-            - **URL**: {context.get('url', 'N/A')}
-            - **Page Title**: {context.get('title', 'N/A')}
+        Args:
+            context (dict): Captured failure context
+            original_test_code (str): Source code of the original test
 
-            ## Error Message:
-            ```
-            {context['error_message']}
-            ```
+        Returns:
+            str: Formatted prompt string
+        """
+        return _PROMPT_TMPL.safe_substitute(
+            section=self._build_single_section(context, original_test_code)
+        )
 
-            ## Original Test Code:
-            ```python
-            {original_test_code}
-            ```
+    def _build_batch_prompt(self, items):
+        """
+        Pack several failures into one prompt so the shared instructions are only
+        sent (and prefilled by the model) once.
 
-            ## Test Documentation:
-            {context.get('test_docstring', 'No test docstring provided')}
+        Args:
+            items (list[tuple]): (context, original_test_code) pairs
 
-            ## DOM Context (truncated):
-            ```html
-            {context.get('dom', 'No DOM captured')}
-            ```
+        Returns:
+            str: Formatted prompt string asking for a {"results": [...]} object
+        """
+        sections = "".join(
+            self._build_single_section(context, code, idx)
+            for idx, (context, code) in enumerate(items, start=1)
+        )
+        return _BATCH_PROMPT_TMPL.safe_substitute(count=len(items), sections=sections)
 
-            ## Your Task:
-            Analyze this test failure and provide:
+    def _build_request_params(self, prompt, screenshot_path=None, response_format=_HEALING_SCHEMA):
+        """
+        Build the generate() keyword arguments shared by the sync and async queries.
 
-            1. **Root Cause Analysis**: What exactly caused this test to fail?
-            2. **Confidence Score**: Rate your confidence in the analysis (0.0 to 1.0)
-            3. **Suggested Fix**: Specific code changes or approach to fix the test
-            4. **Updated Test Code**: Always provide a corrected version of the test code that fixes the failure. Return only the updated test function code in Python.
-            5. **Recommendations**: Additional suggestions for test stability
+        Args:
+            prompt (str): The prompt string to send
+            screenshot_path (str | list[str]): Optional path(s) to screenshot images
+            response_format (dict | str): JSON schema (or 'json') for Ollama's server-side JSON mode
 
-            IMPORTANT: Respond ONLY with a valid JSON object, no markdown formatting or extra text.
+        Returns:
+            dict: Request parameters for Client.generate / AsyncClient.generate
+        """
+        request_params = {
+            'model': self.model,
+            'prompt': prompt,
+            'stream': False,  # The queries switch this on to stop at the closing brace
+            'format': response_format,  # Server emits bare JSON, so parsing short-circuits
+            'keep_alive': self.keep_alive,
+            'system': "You are an expert Quality Assurance Engineer and test automation specialist. Respond ONLY with valid JSON, no markdown or extra text.",
+            'options': {
+                'temperature': self.temperature,
+                'num_ctx': self.num_ctx,  # Sized to the model, see num_ctx
+            }
+        }
 
-            {{
-                "analysis": "Detailed analysis of what went wrong",
-                "root_cause": "Specific root cause identified",
-                "confidence": 0.85,
-                "suggested_fix": "Specific fix recommendation",
-                "updated_test_code": "Complete fixed test code (if confident)",
-                "recommendations": "Additional recommendations for improvement"
-            }}
+        # Add screenshots if available and the model can actually look at them
+        paths = screenshot_path if isinstance(screenshot_path, list) else [screenshot_path]
+        images = [str(path) for path in paths if path and Path(path).exists()]
+        if images and self.vision_capable:
+            request_params['images'] = images
+            logger.debug("📸 Including screenshot(s): %s", ", ".join(images))
+        elif images and not self._vision_warned:
+            self._vision_warned = True
+            logger.warning(
+                "📸 %s is not a vision model; screenshots are not sent "
+                "(set AI_HEALING_VISION=true to override)",
+                self.model,
+            )
 
-            Focus on common Playwright issues like:
-            - Element not found/changed selectors
-            - Timing issues and race conditions  
-            - Network/loading problems
-            - State management issues
-            - Flaky test patterns
-            """
-        return prompt
+        return request_params
 
     def _query_ollama(self, prompt, screenshot_path=None):
         """
@@ -214,33 +783,100 @@ class OllamaAIHealingService:
         Returns:
             str or None: Ollama response text or None on failure
         """
-        try:
-            print(f"🧠 Querying Ollama model: {self.model}")
-
-            # Prepare the request
-            request_params = {
-                'model': self.model,
-                'prompt': prompt,
-                'stream': False,
-                'system': "You are an expert Quality Assurance Engineer and test automation specialist. Respond ONLY with valid JSON, no markdown or extra text.",
-                'options': {
-                    'temperature': self.temperature,
-                    'num_ctx': 8192,  # Larger context window
-                }
-            }
+        logger.info("🧠 Querying Ollama model: %s", self.model)
+        request_params = self._build_request_params(prompt, screenshot_path)
 
-            # Add screenshot if available
-            if screenshot_path and Path(screenshot_path).exists():
-                request_params['images'] = [screenshot_path]
-                print(f"📸 Including screenshot: {screenshot_path}")
+        # Raw REST call: only the response string is needed, so skip the SDK's
+        # pydantic GenerateResponse; the REST API wants images base64-encoded
+        try:
+            payload = dict(request_params)
+            if 'images' in payload:
+                payload['images'] = [
+                    base64.b64encode(Path(path).read_bytes()).decode() for path in payload['images']
+                ]
+            payload['stream'] = True
+            # Stream tokens and stop reading once the top-level JSON object closes;
+            # closing the connection makes Ollama drop any trailing prose
+            scanner = _BraceScanner()
+            parts = []
+            with self.http.post(self._gen_url, json=payload, stream=True, timeout=(10, 600)) as r:
+                r.raise_for_status()
+                for line in r.iter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    piece = chunk.get('response', '')
+                    parts.append(piece)
+                    if scanner.feed(piece) or chunk.get('done'):
+                        break
+            return ''.join(parts)
+        except Exception as e:
+            debug_print(f"🤖 [DEBUG] Direct generate call failed, retrying through the SDK: {e}")
 
+        try:
             response = self.client.generate(**request_params)
             return response['response']
 
         except Exception as e:
-            print(f"🤖 Ollama query failed: {e}")
+            logger.warning("🤖 Ollama query failed: %s", e)
+            return None
+
+    def _get_query_slots(self):
+        """
+        Semaphore bounding in-flight async generations to AI_HEALING_CONCURRENCY.
+        Created per event loop, since each session's healing runs in its own asyncio.run().
+        """
+        loop = asyncio.get_running_loop()
+        if self._query_slots is None or self._query_slots[0] is not loop:
+            self._query_slots = (loop, asyncio.Semaphore(self.concurrency))
+        return self._query_slots[1]
+
+    async def _query_ollama_async(self, prompt, screenshot_path=None, response_format=_HEALING_SCHEMA):
+        """
+        Async version of _query_ollama using ollama.AsyncClient, so several
+        healing requests can be in flight at once.
+
+        Args:
+            prompt (str): The prompt string to send
+            screenshot_path (str): Optional path to screenshot image
+            response_format (dict | str): JSON schema for the reply (batch prompts pass their own)
+
+        Returns:
+            str or None: Ollama response text or None on failure
+        """
+        try:
+            logger.info("🧠 Querying Ollama model (async): %s", self.model)
+            request_params = self._build_request_params(prompt, screenshot_path, response_format)
+            request_params['stream'] = True
+            # Stop consuming tokens once the top-level JSON object has closed
+            scanner = _BraceScanner()
+            parts = []
+            async with self._get_query_slots():
+                stream = await self.aclient.generate(**request_params)
+                try:
+                    async for chunk in stream:
+                        piece = chunk['response']
+                        parts.append(piece)
+                        if scanner.feed(piece):
+                            break
+                finally:
+                    await stream.aclose()
+            return ''.join(parts)
+
+        except Exception as e:
+            logger.warning("🤖 Ollama query failed: %s", e)
             return None
 
+    @staticmethod
+    def _unwrap_batch_results(parsed):
+        """
+        Batch prompts answer with {"results": [...]}, one entry per failure;
+        return that list, or the parsed object unchanged for a single failure.
+        """
+        if isinstance(parsed, dict) and isinstance(parsed.get("results"), list):
+            return parsed["results"]
+        return parsed
+
     def _parse_ollama_response(self, response_text):
         """
         Parse Ollama response and extract JSON with robust error handling.
@@ -252,62 +888,57 @@ class OllamaAIHealingService:
             dict or None: Parsed JSON dict or None if parsing failed
         """
         if not response_text:
-            print("🤖 Empty response from Ollama")
+            logger.warning("🤖 Empty response from Ollama")
             return None
 
-        # Log the raw response for debugging
-        print(f"🤖 Raw Ollama response (first 200 chars): {response_text[:200]}...")
-
-        import re
+        # Log the raw response for debugging (the slice is only built when it will be shown)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🤖 Raw Ollama response (first 200 chars): %s...", response_text[:200])
 
-        # Strategy 1: Try to find JSON inside a code block
-        json_match = re.search(r'```json\s*({.*?})\s*```', response_text, re.DOTALL)
-        if json_match:
-            candidate = json_match.group(1)
-            print("🤖 Found JSON in code block")
+        # Fast path: with `format` set the server returns bare JSON, so no extraction is needed
+        try:
+            parsed = orjson.loads(response_text)
+            logger.debug("✅ Successfully parsed JSON response")
+            return self._unwrap_batch_results(parsed)
+        except orjson.JSONDecodeError:
+            pass
+
+        # Otherwise take the first balanced {...} (fenced or surrounded by prose),
+        # falling back to the whole response
+        candidate = _extract_json_object(response_text)
+        if candidate is not None:
+            logger.debug("🤖 Found JSON object in text")
         else:
-            # Strategy 2: Try to find any code block
-            code_match = re.search(r'```(.*?)```', response_text, re.DOTALL)
-            if code_match:
-                candidate = code_match.group(1).strip()
-                print("🤖 Found content in code block")
-            else:
-                # Strategy 3: Look for JSON-like structure anywhere in text
-                json_pattern = re.search(r'({\s*"[^"]+":.*?})', response_text, re.DOTALL)
-                if json_pattern:
-                    candidate = json_pattern.group(1)
-                    print("🤖 Found JSON-like structure in text")
-                else:
-                    # Strategy 4: Use the entire response
-                    candidate = response_text.strip()
-                    print("🤖 Using entire response as candidate")
+            candidate = response_text.strip()
+            logger.debug("🤖 Using entire response as candidate")
 
         # Try to parse the candidate as JSON
         try:
-            parsed = json.loads(candidate)
-            print("✅ Successfully parsed JSON response")
-            return parsed
-        except json.JSONDecodeError as e:
-            print(f"🤖 JSON parsing failed: {e}")
-
-            # Strategy 5: Try to fix common JSON issues
+            parsed = orjson.loads(candidate)
+            logger.debug("✅ Successfully parsed JSON response")
+            return self._unwrap_batch_results(parsed)
+        except orjson.JSONDecodeError as e:
+            logger.info("🤖 JSON parsing failed: %s", e)
+
+            # Fallback: lenient JSON5 parse of the candidate with any leading/trailing
+            # non-JSON text removed; tolerates trailing commas, comments, single quotes
+            # and unquoted keys. Much slower than orjson, so only used after it fails.
             try:
-                # Remove any leading/trailing non-JSON text
-                cleaned = re.sub(r'^[^{]*', '', candidate)
-                cleaned = re.sub(r'[^}]*$', '', cleaned)
+                cleaned = _RE_LEAD.sub('', candidate)
+                cleaned = _RE_TRAIL.sub('', cleaned)
 
                 if cleaned:
-                    parsed = json.loads(cleaned)
-                    print("✅ Successfully parsed cleaned JSON")
-                    return parsed
-            except:
+                    parsed = json5.loads(cleaned)
+                    logger.debug("✅ Successfully parsed JSON5-tolerant response")
+                    return self._unwrap_batch_results(parsed)
+            except ValueError:
                 pass
 
-            # Strategy 6: Try to extract key information manually
+            # Last resort: try to extract key information manually
             try:
-                analysis_match = re.search(r'"analysis"\s*:\s*"([^"]*)"', response_text)
-                root_cause_match = re.search(r'"root_cause"\s*:\s*"([^"]*)"', response_text)
-                confidence_match = re.search(r'"confidence"\s*:\s*([0-9.]+)', response_text)
+                analysis_match = _RE_ANALYSIS.search(response_text)
+                root_cause_match = _RE_ROOT_CAUSE.search(response_text)
+                confidence_match = _RE_CONFIDENCE.search(response_text)
 
                 manual_parse = {
                     "analysis": analysis_match.group(1) if analysis_match else response_text[:500],
@@ -316,13 +947,13 @@ class OllamaAIHealingService:
                     "suggested_fix": "Manual review required - JSON parsing failed",
                     "recommendations": "Check Ollama model output format"
                 }
-                print("🔧 Manually extracted key information")
+                logger.info("🔧 Manually extracted key information")
                 return manual_parse
-            except:
+            except (ValueError, AttributeError):
                 pass
 
             # Final fallback: Return raw response in structured format
-            print("⚠️ All parsing strategies failed, returning raw response")
+            logger.warning("⚠️ All parsing strategies failed, returning raw response")
             return {
                 "analysis": response_text,
                 "root_cause": "Could not parse structured response",
@@ -332,6 +963,66 @@ class OllamaAIHealingService:
                 "raw_unparsed_response": response_text
             }
 
+    def _process_raw_response(self, raw_response):
+        """
+        Turn a raw Ollama response into the healing result dict.
+
+        Args:
+            raw_response (str): Raw response text, or None if the query failed
+
+        Returns:
+            dict: Parsed Ollama response or error dict
+        """
+        debug_print(f"🤖 [DEBUG] Raw Ollama response:\n{raw_response}")
+
+        if raw_response:
+            debug_print("🤖 [DEBUG] Parsing Ollama response...")
+            parsed_response = self._parse_ollama_response(raw_response)
+
+            # A single-failure prompt answered in the batch shape; use its only result
+            if isinstance(parsed_response, list):
+                parsed_response = parsed_response[0] if parsed_response and isinstance(parsed_response[0], dict) else None
+
+            if parsed_response is None:
+                debug_print("🤖 [DEBUG] Parsed response is None, returning error dict")
+                return {"error": "Failed to parse Ollama response"}
+
+            # Add raw response for debugging
+            parsed_response['raw_ollama_response'] = raw_response
+
+            debug_print(f"🤖 [DEBUG] Parsed Ollama response:\n{parsed_response}")
+            return parsed_response
+
+        debug_print("🤖 [DEBUG] No response received from Ollama")
+        return {"error": "No response from Ollama"}
+
+    def _cache_lookup(self, context, original_test_code):
+        """
+        Look up a previous analysis of the same failure signature.
+
+        Args:
+            context (dict): Captured failure context
+            original_test_code (str): Source code of the original test
+
+        Returns:
+            tuple: (cache key or None when caching is off, cached response or None)
+        """
+        if not self.cache_enabled:
+            return None, None
+        key = self.cache.make_key(self.model, self.temperature, context, original_test_code)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("♻️  Reusing cached Ollama analysis for %s", context.get("test_name"))
+            cached["cached"] = True
+        return key, cached
+
+    def _cache_store(self, key, ai_response):
+        """
+        Store a successful analysis under its failure signature (errors are not cached).
+        """
+        if key and ai_response and "error" not in ai_response:
+            self.cache.set(key, ai_response)
+
     def call_ollama_healing(self, context, original_test_code, screenshot_path=None):
         """
         Call Ollama for test healing analysis.
@@ -344,42 +1035,183 @@ class OllamaAIHealingService:
         Returns:
             dict: Parsed Ollama response or error dict
         """
+        key, cached = self._cache_lookup(context, original_test_code)
+        if cached is not None:
+            return cached
+
         try:
             debug_print("🤖 [DEBUG] Building healing prompt...")
             prompt = self._build_healing_prompt(context, original_test_code)
             debug_print(f"🤖 [DEBUG] Prompt built:\n{prompt}")
 
             debug_print("🤖 [DEBUG] Querying Ollama service...")
-            raw_response = self._query_ollama(prompt, screenshot_path)
-            debug_print(f"🤖 [DEBUG] Raw Ollama response:\n{raw_response}")
-
-            if raw_response:
-                debug_print("🤖 [DEBUG] Parsing Ollama response...")
-                parsed_response = self._parse_ollama_response(raw_response)
+            ai_response = self._process_raw_response(self._query_ollama(prompt, screenshot_path))
+            self._cache_store(key, ai_response)
+            return ai_response
 
-                if parsed_response is None:
-                    debug_print("🤖 [DEBUG] Parsed response is None, returning error dict")
-                    return {"error": "Failed to parse Ollama response"}
-
-                # Add raw response for debugging
-                parsed_response['raw_ollama_response'] = raw_response
+        except Exception as e:
+            logger.warning("🤖 Ollama healing service error: %s", e)
+            traceback.print_exc()
+            return {"error": str(e)}
 
-                debug_print(f"🤖 [DEBUG] Parsed Ollama response:\n{parsed_response}")
-                return parsed_response
+    async def _heal_async(self, context, original_test_code, screenshot_path=None):
+        """
+        Query Ollama for one failure without consulting the cache.
+        """
+        try:
+            debug_print("🤖 [DEBUG] Building healing prompt...")
+            prompt = self._build_healing_prompt(context, original_test_code)
+            debug_print(f"🤖 [DEBUG] Prompt built:\n{prompt}")
 
-            debug_print("🤖 [DEBUG] No response received from Ollama")
-            return {"error": "No response from Ollama"}
+            debug_print("🤖 [DEBUG] Querying Ollama service (async)...")
+            return self._process_raw_response(await self._query_ollama_async(prompt, screenshot_path))
 
         except Exception as e:
-            print(f"🤖 Ollama healing service error: {e}")
-            import traceback
+            logger.warning("🤖 Ollama healing service error: %s", e)
             traceback.print_exc()
             return {"error": str(e)}
 
+    async def call_ollama_healing_async(self, context, original_test_code, screenshot_path=None):
+        """
+        Async version of call_ollama_healing; see heal_failures for running many at once.
+
+        Args:
+            context (dict): Captured failure context
+            original_test_code (str): Source code of the original test
+            screenshot_path (str): Optional path to screenshot image
+
+        Returns:
+            dict: Parsed Ollama response or error dict
+        """
+        key, cached = self._cache_lookup(context, original_test_code)
+        if cached is not None:
+            return cached
+        ai_response = await self._heal_async(context, original_test_code, screenshot_path)
+        self._cache_store(key, ai_response)
+        return ai_response
+
+    async def _heal_batch_async(self, entries):
+        """
+        Query Ollama for several failures in one prompt, without consulting the cache.
+        Results are matched back by their "index" (or by position when the count
+        matches); only failures without a usable result are healed individually.
+        """
+        results = [None] * len(entries)
+        if len(entries) > 1:
+            try:
+                prompt = self._build_batch_prompt(
+                    [(entry["context"], entry["original_test_code"]) for entry in entries]
+                )
+                debug_print(f"🤖 [DEBUG] Batch prompt built for {len(entries)} failures")
+                raw_response = await self._query_ollama_async(
+                    prompt, [entry["screenshot_path"] for entry in entries], _BATCH_HEALING_SCHEMA
+                )
+                parsed = self._parse_ollama_response(raw_response) if raw_response else None
+                if isinstance(parsed, list):
+                    for pos, result in enumerate(parsed):
+                        if not isinstance(result, dict):
+                            continue
+                        idx = result.pop("index", None)
+                        slot = idx - 1 if isinstance(idx, int) else (pos if len(parsed) == len(entries) else None)
+                        if slot is not None and 0 <= slot < len(entries) and results[slot] is None:
+                            result['raw_ollama_response'] = raw_response
+                            results[slot] = result
+                missing = results.count(None)
+                if missing:
+                    logger.warning("🤖 Batch response missing %d/%d results, healing those individually", missing, len(entries))
+            except Exception as e:
+                logger.warning("🤖 Batch healing failed, healing individually: %s", e)
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        healed = await asyncio.gather(*(
+            self._heal_async(entries[i]["context"], entries[i]["original_test_code"], entries[i]["screenshot_path"])
+            for i in missing
+        ))
+        for i, result in zip(missing, healed):
+            results[i] = result
+        return results
+
+    async def call_ollama_healing_batch(self, entries):
+        """
+        Heal several failures with a single Ollama request. Cached failures are
+        answered from the cache and left out of the prompt.
+
+        Args:
+            entries (list[dict]): Pending contexts, each with test_name, context,
+                original_test_code and screenshot_path
+
+        Returns:
+            list[dict]: Parsed Ollama response (or error dict) per entry, in order
+        """
+        keys, results = [], []
+        for entry in entries:
+            key, cached = self._cache_lookup(entry["context"], entry["original_test_code"])
+            keys.append(key)
+            results.append(cached)
+
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            fresh = await self._heal_batch_async([entries[i] for i in misses])
+            for i, ai_response in zip(misses, fresh):
+                results[i] = ai_response
+                self._cache_store(keys[i], ai_response)
+        return results
+
+    async def heal_failures(self, entries):
+        """
+        Run healing for several failed tests and write their reports. Failures are
+        packed AI_HEALING_BATCH at a time into one prompt (default 4), and the
+        batches are sent concurrently, at most AI_HEALING_CONCURRENCY requests in
+        flight (default 2); match it to the server's OLLAMA_NUM_PARALLEL setting.
+
+        Args:
+            entries (list[dict]): Pending contexts, each with test_name, context,
+                original_test_code and screenshot_path
+
+        Returns:
+            None
+        """
+        # Identical failures (e.g. one broken selector across parametrized tests) share
+        # a signature; only the first of each is sent to Ollama
+        signatures = [
+            self.cache.make_key(self.model, self.temperature, entry["context"], entry["original_test_code"])
+            for entry in entries
+        ]
+        first_by_signature = {}
+        for i, signature in enumerate(signatures):
+            first_by_signature.setdefault(signature, i)
+        unique = [entries[i] for i in first_by_signature.values()]
+        if len(unique) < len(entries):
+            logger.info("♻️  %d duplicate failure(s) will reuse another test's analysis", len(entries) - len(unique))
+
+        batch_size = max(1, self.batch_size)
+        batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+        batch_responses = await asyncio.gather(*(
+            self.call_ollama_healing_batch(batch) for batch in batches
+        ))
+        unique_responses = [ai_response for ai_responses in batch_responses for ai_response in ai_responses]
+        response_by_signature = dict(zip(first_by_signature, unique_responses))
+
+        reports = []
+        for i, (entry, signature) in enumerate(zip(entries, signatures)):
+            ai_response = response_by_signature[signature]
+            if ai_response and first_by_signature[signature] != i:
+                ai_response = {**ai_response, "cached": True}
+            if ai_response:
+                reports.append(self.generate_healing_report(entry["test_name"], ai_response, entry["context"]))
+            else:
+                logger.warning("🧠 Ollama analysis failed for %s", entry["test_name"])
+        # Report files are written off-thread, so generating them together overlaps the disk I/O
+        await asyncio.gather(*reports)
+        if self.cache_enabled:
+            logger.info("🧠 Healing cache: %d hit(s), %d miss(es)", self.cache.stats["hits"], self.cache.stats["misses"])
+
     def stop_model(self):
         """
         Stop the Ollama model to free resources.
         """
+        if self.cache_enabled:
+            print(f"🧠 Healing cache: {self.cache.stats['hits']} hit(s), {self.cache.stats['misses']} miss(es)")
         try:
             res = self.client.generate(
                 model=self.model,
@@ -401,10 +1233,16 @@ class OllamaAIHealingService:
         Returns:
             str: Source code string or fallback comment
         """
-        try:
-            return inspect.getsource(test_function)
-        except:
-            return f"# Could not extract source for {test_function.__name__}"
+        code = getattr(test_function, "__code__", None)
+        source = _source_cache.get(code) if code is not None else None
+        if source is None:
+            try:
+                source = inspect.getsource(test_function)
+            except:
+                source = f"# Could not extract source for {test_function.__name__}"
+            if code is not None:
+                _source_cache[code] = source
+        return source
 
     async def generate_healing_report(self, test_name, ai_response, context):
         """
@@ -419,109 +1257,67 @@ class OllamaAIHealingService:
             None
         """
         healing_dir = AI_HEALING_REPORT_DIR
-        healing_dir.mkdir(exist_ok=True)
+        healing_dir.mkdir(parents=True, exist_ok=True)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_file = healing_dir / f"{test_name}_{timestamp}_ollama_analysis.md"
 
-        report_content = f"""# 🧠 Ollama AI Healing Report
-
-## Test Information
-- **Test Name**: `{test_name}`
-- **Timestamp**: `{timestamp}`
-- **Model Used**: `{self.model}`
-- **URL**: `{context.get('url', 'N/A')}`
-- **Error Type**: `{context.get('error_type', 'Unknown')}`
-
-## Error Details
-```
-{context.get('error_message', 'No error message')}
-```
-
-## Ollama Analysis
-```
-{ai_response.get('analysis', 'No analysis provided')}
-```
-
-## Root Cause
-```
-{ai_response.get('root_cause', 'Not identified')}
-```
-
-## Suggested Fix
-```
-{ai_response.get('suggested_fix', 'No fix suggested')}
-```
-
-## Updated Code
-```
-{ai_response.get('updated_test_code', 'No fix suggested')}
-```
-
-## Confidence Level
-**{ai_response.get('confidence', 0):.1%}**
-
-## Recommendations
-```
-{ai_response.get('recommendations', 'None provided')}
-```
-
-## Raw Ollama Response
-<details>
-<summary>Click to expand raw response</summary>
-
-```
-{ai_response.get('raw_ollama_response', 'No raw response')}
-```
-</details>
-
----
-*Generated by Ollama AI Healing System*
-"""
-
-        with open(report_file, 'w') as f:
-            f.write(report_content)
-
-        # Save healed test if provided
+        report_content = _REPORT_TMPL.safe_substitute(
+            test_name=test_name,
+            timestamp=timestamp,
+            model=self.model,
+            url=context.get('url', 'N/A'),
+            error_type=context.get('error_type', 'Unknown'),
+            error_message=context.get('error_message', 'No error message'),
+            analysis=ai_response.get('analysis', 'No analysis provided'),
+            root_cause=ai_response.get('root_cause', 'Not identified'),
+            suggested_fix=ai_response.get('suggested_fix', 'No fix suggested'),
+            updated_test_code=ai_response.get('updated_test_code', 'No fix suggested'),
+            confidence=f"{ai_response.get('confidence', 0):.1%}",
+            recommendations=ai_response.get('recommendations', 'None provided'),
+            raw_ollama_response=ai_response.get('raw_ollama_response', 'No raw response'),
+        )
+
+        # Write the report (and healed test, if provided) off the event loop
+        writes = [asyncio.to_thread(report_file.write_text, report_content)]
+        healed_test_file = None
         if 'updated_test_code' in ai_response and ai_response['updated_test_code']:
             healed_test_file = healing_dir / f"{test_name}_{timestamp}_ollama_healed.py"
-            with open(healed_test_file, 'w') as f:
-                f.write(ai_response['updated_test_code'])
+            writes.append(asyncio.to_thread(healed_test_file.write_text, ai_response['updated_test_code']))
+        await asyncio.gather(*writes)
 
+        if healed_test_file:
             print(f"Ollama healed test saved: {healed_test_file}")
 
-        # Console output
-        print(f"\n{'='*80}")
-        print(f"OLLAMA AI HEALING: {test_name}")
-        print(f"{'='*80}")
-        print(f"🤖 Model: {self.model}")
-        print(f"📊 Confidence: {ai_response.get('confidence', 0):.1%}")
-        print(f"🔍 Root Cause: {ai_response.get('root_cause', 'Unknown')}")
-        print(f"💡 Suggestion: {ai_response.get('suggested_fix', 'None')}")
-        print(f"📄 Full Report: {report_file}")
-
-        if ai_response.get('confidence', 0) > self.confidence_threshold:
-            print(f"✅ High confidence - Review the healed test")
-        else:
-            print(f"⚠️  Low confidence - Manual review recommended")
-
-        print(f"{'='*80}\n")
-
-# ------------------------------------------------------------------------------
-# Global service instance
-# ------------------------------------------------------------------------------
-
-_ollama_service = OllamaAIHealingService()
+        # Console summary, emitted as one write
+        verdict = (
+            "✅ High confidence - Review the healed test"
+            if ai_response.get('confidence', 0) > self.confidence_threshold
+            else "⚠️  Low confidence - Manual review recommended"
+        )
+        print("\n".join([
+            f"\n{'='*80}",
+            f"OLLAMA AI HEALING: {test_name}",
+            f"{'='*80}",
+            f"🤖 Model: {self.model}",
+            f"📊 Confidence: {ai_response.get('confidence', 0):.1%}",
+            f"🔍 Root Cause: {ai_response.get('root_cause', 'Unknown')}",
+            f"💡 Suggestion: {ai_response.get('suggested_fix', 'None')}",
+            f"📄 Full Report: {report_file}",
+            verdict,
+            f"{'='*80}\n",
+        ]))
 
 # ------------------------------------------------------------------------------
 # Function: get_ollama_service
 # ------------------------------------------------------------------------------
 
+@functools.cache
 def get_ollama_service():
     """
-    Returns the singleton OllamaAIHealingService instance.
+    Returns the singleton OllamaAIHealingService instance, created on first call.
     """
-    return _ollama_service
+    return OllamaAIHealingService()
 
 # ------------------------------------------------------------------------------
 # Thread-safe dictionaries and locks
@@ -529,6 +1325,23 @@ def get_ollama_service():
 
 _ollama_checked = False
 
+# ------------------------------------------------------------------------------
+# Function: _page_fixture_name
+# ------------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=256)
+def _page_fixture_name(fixture_names):
+    """
+    Return the first fixture name that conventionally holds a page ("page",
+    "*_page", "app", "*_app"), or None. Cached per fixture-name tuple, so tests
+    sharing a signature resolve it once.
+    """
+    return next(
+        (name for name in fixture_names
+         if name == "page" or name == "app" or name.endswith(("_page", "_app"))),
+        None
+    )
+
 # ------------------------------------------------------------------------------
 # Function: _find_page_object
 # ------------------------------------------------------------------------------
@@ -545,12 +1358,21 @@ def find_page_object(item):
     """
     page = None
     funcargs = getattr(item, 'funcargs', {})
+
+    # Fast path: the page-like fixture name is resolved once per fixture signature
+    name = _page_fixture_name(tuple(funcargs))
+    if name:
+        value = funcargs[name]
+        candidate = value if name == "page" or name.endswith("_page") else getattr(value, "page", None)
+        if hasattr(candidate, "screenshot"):
+            return candidate
+
     if not page:
         for name, value in funcargs.items():
             if name == "page" and hasattr(value, 'screenshot'):
                 page = value
                 break
-            elif name == "app" and hasattr(value, "page"):
+            elif (name == "app" or name.endswith("_app")) and hasattr(value, "page"):
                 page = value.page
                 break
             elif name.endswith("_page") and hasattr(value, "screenshot"):
@@ -581,16 +1403,18 @@ def ensure_ollama_ready(model_name=None, host=None, max_wait=180):
     if _ollama_checked:
         return True
 
+    service = get_ollama_service()
     if not model_name:
-        model_name = _ollama_service.model
+        model_name = service.model
     if not host:
-        host = _ollama_service.ollama_host
+        host = service.ollama_host
+    http = service.http
 
     print(f"🤖 Checking Ollama service at {host}...")
     print(f"🤖 Ollama executable path: {shutil.which('ollama')}")
     try:
         # Try to ping the Ollama API
-        response = requests.get(f"{host}/api/tags", timeout=3)
+        response = http.get(f"{host}/api/tags", timeout=3)
         if response.status_code == 200:
             print("🤖 Ollama service is already running.")
         else:
@@ -609,16 +1433,22 @@ def ensure_ollama_ready(model_name=None, host=None, max_wait=180):
             )
             print(f"🤖 Ollama process started with PID: {proc.pid}")
             print("🤖 Waiting for Ollama service to start...")
-            for i in range(30):
+            # Exponential backoff from 50 ms so a fast start is noticed almost immediately
+            delay, waited, next_notice = 0.05, 0.0, 5.0
+            while waited < 30.0:
                 try:
-                    response = requests.get(f"{host}/api/tags", timeout=2)
+                    response = http.get(f"{host}/api/tags", timeout=2)
                     if response.status_code == 200:
                         print("🤖 Ollama service started successfully.")
                         break
                 except Exception:
-                    time.sleep(1)
-                    if i % 5 == 0:
-                        print(f"🤖 Still waiting for Ollama... ({i+1}/30)")
+                    pass
+                time.sleep(delay)
+                waited += delay
+                delay = min(delay * 1.5, 2.0)
+                if waited >= next_notice:
+                    print(f"🤖 Still waiting for Ollama... ({waited:.0f}s/30s)")
+                    next_notice += 5.0
             else:
                 print("❌ Failed to start Ollama service within 30 seconds.")
                 return False
@@ -630,7 +1460,7 @@ def ensure_ollama_ready(model_name=None, host=None, max_wait=180):
     try:
         print(f"🤖 Checking if model {model_name} is available...")
         # List available models
-        resp = requests.get(f"{host}/api/tags", timeout=5)
+        resp = http.get(f"{host}/api/tags", timeout=5)
         if resp.status_code != 200:
             print(f"❌ Failed to get model list: {resp.status_code}")
             return False
@@ -638,44 +1468,74 @@ def ensure_ollama_ready(model_name=None, host=None, max_wait=180):
         model_exists = any(model_name in m.get("name", "") for m in tags)
         if not model_exists:
             print(f"🤖 Model {model_name} not found. Attempting to pull...")
-            pull_resp = requests.post(
-                f"{host}/api/pull", 
-                json={"name": model_name}, 
-                timeout=180  # Pulling can take a while
-            )
-            if pull_resp.status_code == 200:
-                print(f"🤖 Model {model_name} pulled successfully.")
-            else:
-                print(f"❌ Failed to pull model {model_name}: {pull_resp.text}")
-                return False
+            # Stream progress lines; the read timeout aborts only when no line arrives
+            # for 60 s, so a slow but progressing download is never cut off
+            with http.post(
+                f"{host}/api/pull",
+                json={"name": model_name, "stream": True},
+                stream=True,
+                timeout=(10, 60)
+            ) as pull_resp:
+                if pull_resp.status_code != 200:
+                    print(f"❌ Failed to pull model {model_name}: {pull_resp.text}")
+                    return False
+                last_status = None
+                for line in pull_resp.iter_lines():
+                    if not line:
+                        continue
+                    event = orjson.loads(line)
+                    if "error" in event:
+                        print(f"❌ Failed to pull model {model_name}: {event['error']}")
+                        return False
+                    status = event.get("status", "")
+                    if status != last_status:
+                        debug_print(f"🤖 [DEBUG] Pull: {status}")
+                        last_status = status
+                    if status.startswith("success"):
+                        break
+                else:
+                    print(f"❌ Pull of model {model_name} ended without success")
+                    return False
+            print(f"🤖 Model {model_name} pulled successfully.")
         # Warm up the model by waiting for a real, non-error response
         print(f"🤖 Warming up model {model_name} (waiting for a real response)...")
         start = time.time()
+        delay = 0.2  # Backoff between probes, capped at 3 s
         while time.time() - start < max_wait:
             try:
-                gen_resp = requests.post(
+                # Stream the reply: the first non-empty token proves the model is loaded
+                with http.post(
                     f"{host}/api/generate",
                     json={
                         "model": model_name,
                         "prompt": "Hello",
-                        "stream": False,
+                        "stream": True,
+                        "keep_alive": service.keep_alive,
                         "options": {"num_predict": 5}
                     },
+                    stream=True,
                     timeout=30
-                )
-                if gen_resp.status_code == 200:
-                    response_data = gen_resp.json()
-                    if "response" in response_data and response_data["response"].strip():
-                        print(f"🤖 Model {model_name} is loaded and ready.")
-                        _ollama_checked = True
-                        return True
-                    elif "error" in response_data:
-                        print(f"🤖 Model not ready yet: {response_data['error']}")
-                else:
-                    print(f"🤖 Model not ready, status: {gen_resp.status_code}")
+                ) as gen_resp:
+                    if gen_resp.status_code == 200:
+                        for line in gen_resp.iter_lines():
+                            if not line:
+                                continue
+                            response_data = orjson.loads(line)
+                            if response_data.get("response", "").strip():
+                                print(f"🤖 Model {model_name} is loaded and ready.")
+                                _ollama_checked = True
+                                return True
+                            if "error" in response_data:
+                                print(f"🤖 Model not ready yet: {response_data['error']}")
+                                break
+                            if response_data.get("done"):
+                                break
+                    else:
+                        print(f"🤖 Model not ready, status: {gen_resp.status_code}")
             except Exception as e:
                 print(f"🤖 Waiting for model to load: {e}")
-            time.sleep(3)
+            time.sleep(delay)
+            delay = min(delay * 1.5, 3.0)
         print(f"❌ Model {model_name} did not become ready in {max_wait} seconds.")
         return False
     except requests.exceptions.Timeout:
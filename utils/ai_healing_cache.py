@@ -0,0 +1,125 @@
+"""
+===============================================================================
+AI Healing Response Cache
+===============================================================================
+
+This module provides HealingResponseCache, a memory + disk cache for parsed
+Ollama healing responses. The same flaky test failing with the same error across
+retries, runs or CI shards reuses the earlier analysis instead of paying for a
+full inference again.
+
+Features:
+    - Keys are a SHA-256 over model, temperature, error type, the error message
+      with addresses/numbers normalized away, the page URL, the test function name
+      (without parametrize ids) and a hash of the test module source
+    - In-memory dict in front of one JSON file per key on disk
+    - Disk entries older than max_age (by file mtime) are treated as misses and removed
+    - Hit/miss statistics for reporting
+
+Usage:
+    cache = HealingResponseCache(AI_HEALING_CACHE_DIR, max_age=7 * 24 * 3600)
+    key = cache.make_key(model, temperature, context, original_test_code)
+    cached = cache.get(key)
+    if cached is None:
+        cached = query_model(...)
+        cache.set(key, cached)
+
+Author: PMAC
+Date: [2025-08-20]
+===============================================================================
+"""
+
+import hashlib
+import orjson
+import re
+import time
+from pathlib import Path
+
+# Hex addresses and numbers (ports, timeouts, line numbers) vary between otherwise identical failures
+_VOLATILE_TOKENS = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+# ------------------------------------------------------------------------------
+# Class: HealingResponseCache
+# ------------------------------------------------------------------------------
+
+class HealingResponseCache:
+    """
+    Memory + disk cache of parsed healing responses, keyed on the failure signature.
+    """
+
+    def __init__(self, cache_dir, max_age=None):
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age  # Seconds; None keeps disk entries indefinitely
+        self._memory = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model, temperature, context, original_test_code):
+        """
+        Build the cache key for a failure.
+
+        Args:
+            model (str): Ollama model name
+            temperature (float): Sampling temperature
+            context (dict): Captured failure context
+            original_test_code (str): Source code of the original test
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        signature = {
+            "m": model,
+            "t": temperature,
+            "et": context.get("error_type", "Unknown"),
+            "em": _VOLATILE_TOKENS.sub("N", context.get("error_message", "")),
+            "u": context.get("url", ""),
+            # The source hash covers the whole module, so the function name keeps two tests
+            # of one file that fail the same way from sharing (and receiving) one analysis
+            "n": context.get("test_name", "").split("[", 1)[0],
+            "c": hashlib.sha256((original_test_code or "").encode()).hexdigest(),
+        }
+        return hashlib.sha256(orjson.dumps(signature, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            dict or None: Cached parsed response, or None on a miss
+        """
+        value = self._memory.get(key)
+        if value is None:
+            path = self.cache_dir / f"{key}.json"
+            try:
+                if self.max_age is not None and time.time() - path.stat().st_mtime > self.max_age:
+                    # Page objects and the app change underneath an analysis; expire it
+                    path.unlink()
+                    raise FileNotFoundError(path)
+                value = orjson.loads(path.read_bytes())
+                self._memory[key] = value
+            except (OSError, ValueError):
+                value = None
+
+        self.stats["hits" if value is not None else "misses"] += 1
+        return dict(value) if value is not None else None
+
+    def set(self, key, value):
+        """
+        Store a parsed response in memory and on disk.
+
+        Args:
+            key (str): Cache key from make_key
+            value (dict): Parsed Ollama response
+
+        Returns:
+            None
+        """
+        self._memory[key] = value
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{key}.json").write_bytes(orjson.dumps(value))
+        except (OSError, orjson.JSONEncodeError) as e:
+            print(f"🤖 Could not write healing cache entry: {e}")
@@ -1,15 +1,136 @@
-import functools
+import asyncio
+import base64
+import inspect
+import itertools
+import logging
 import os
+import time
+import weakref
 import allure
-from datetime import datetime
 from config.artifact_paths import SCREENSHOT_DIR
 
+# Per-failure messages; pytest shows them under "Captured log call" for the failing
+# test at the level set by its logging config (log_level in pytest.ini)
+logger = logging.getLogger(__name__)
+
+# Failure-path constants, built once at import
+_TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S"
+# SCREENSHOT_FORMAT=jpeg (with SCREENSHOT_QUALITY, default 60) trades a little fidelity
+# for much smaller files and Allure uploads; png stays the default
+_FORMATS = {
+    "png": (".png", allure.attachment_type.PNG),
+    "jpeg": (".jpg", allure.attachment_type.JPG),
+}
+_FORMAT = "jpeg" if os.environ.get("SCREENSHOT_FORMAT", "png").lower() in ("jpeg", "jpg") else "png"
+_EXTENSION, _ATTACHMENT_TYPE = _FORMATS[_FORMAT]
+
+def _parse_quality(raw):
+    """SCREENSHOT_QUALITY as an int clamped to 0-100; invalid values fall back to 60."""
+    try:
+        quality = int(raw)
+    except ValueError:
+        logger.warning("Invalid SCREENSHOT_QUALITY %r; using 60", raw)
+        return 60
+    return min(max(quality, 0), 100)
+
+_QUALITY = _parse_quality(os.environ.get("SCREENSHOT_QUALITY", "60")) if _FORMAT == "jpeg" else None
+# Static for the run (.env is loaded by the root conftest before test modules import this)
+_SCREENSHOTS_ENABLED = os.environ.get("SKIP_SCREENSHOTS", "0") != "1"
+# PERSIST_SCREENSHOTS=0 keeps screenshots in Allure only and skips the file write
+_PERSIST_SCREENSHOTS = os.environ.get("PERSIST_SCREENSHOTS", "1") == "1"
+_screenshot_dir_ready = False
+# Paths are built by string concatenation on this prefix rather than Path division
+_SCREENSHOT_DIR_STR = str(SCREENSHOT_DIR) + os.sep
+# Per-process sequence suffix: failures within the same second (reruns) never overwrite each other
+_SEQ = itertools.count()
+# Sentinel for "page fixture name not resolved yet" (None is a valid resolution)
+_MISSING = object()
+# Page -> CDP session for screenshots (None off Chromium), reused across failures in a worker
+_cdp_sessions = weakref.WeakKeyDictionary()
+
+def screenshot_test_name(nodeid):
+    """
+    Filesystem-safe screenshot name for a pytest nodeid. The root conftest stores it
+    on each item as _screenshot_name at collection, so failures (and reruns) reuse it.
+    """
+    return nodeid.replace("/", "_").replace("::", "_")
+
+def _is_page_fixture_name(name):
+    """
+    Naming convention for fixtures that give access to a page: 'app', '*_app',
+    '*_page' (page objects with a .page attribute) or the raw Playwright 'page'.
+    """
+    return name == "app" or name.endswith("_app") or name.endswith("_page") or name == "page"
+
+def _page_from_fixture(name, value):
+    """
+    Return (page, page_source) for a fixture matching _is_page_fixture_name,
+    or (None, None) if a page-object fixture has no .page attribute.
+    """
+    if name == "page":
+        return value, "page fixture"
+    page = getattr(value, "page", None)
+    if page is None:
+        return None, None
+    return page, "app fixture" if (name == "app" or name.endswith("_app")) else f"{name} fixture"
+
+def _shallow_wraps(func):
+    """
+    functools.wraps without the annotation copies: only what pytest reads from a test.
+    __dict__ must come along, since pytest.mark decorators applied below this one
+    store their marks (pytestmark) there; __wrapped__ keeps fixture resolution working.
+    """
+    def decorate(wrapper):
+        wrapper.__module__ = func.__module__
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__dict__.update(func.__dict__)
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorate
+
+def _write_file(path, data):
+    """Write bytes to a path given as a string (run via asyncio.to_thread)"""
+    with open(path, "wb") as f:
+        f.write(data)
+
+async def _capture_full_page(page):
+    """
+    Full-page image bytes in _FORMAT. On Chromium this is one Page.captureScreenshot over a cached
+    CDP session, clipped to the layout size; other browsers use page.screenshot.
+    """
+    if page not in _cdp_sessions:
+        try:
+            _cdp_sessions[page] = await page.context.new_cdp_session(page)
+        except Exception:
+            _cdp_sessions[page] = None
+    cdp = _cdp_sessions[page]
+    if cdp is not None:
+        try:
+            layout = await cdp.send("Page.getLayoutMetrics")
+            size = layout.get("cssContentSize") or layout["contentSize"]
+            params = {
+                "format": _FORMAT,
+                "captureBeyondViewport": True,
+                "clip": {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1},
+            }
+            if _QUALITY is not None:
+                params["quality"] = _QUALITY
+            result = await cdp.send("Page.captureScreenshot", params)
+            return base64.b64decode(result["data"])
+        except Exception:
+            pass
+    if _QUALITY is not None:
+        return await page.screenshot(full_page=True, type="jpeg", quality=_QUALITY)
+    return await page.screenshot(full_page=True)
+
 def screenshot_on_failure(func):
     """
     Decorator that automatically captures a screenshot on test failure.
     Works with any test that has 'app', 'login_page', or 'page' fixture.
     
-    By convention, any fixture named 'app' or ending with '_page' is assumed
+    By convention, any fixture named 'app', ending with '_app', or ending with '_page' is assumed
     to be a page object that has a .page attribute
     
     Note: This decorator will automatically find page objects from the test's
@@ -21,82 +142,99 @@ def screenshot_on_failure(func):
         async def test_something(app):  # No need for 'request' parameter
             # ... test code ...
     """
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        # Try to find request fixture if it was passed
-        request = kwargs.get('request')
-        
-        # Find page object using the same scalable logic
-        page = None
-        page_source = None
-        
-        # Loop through all kwargs to find page objects
+    # Screenshots disabled for the run: leave the test unwrapped (no extra coroutine frame)
+    if not _SCREENSHOTS_ENABLED:
+        return func
+
+    # Already decorated: wrapping again would only capture the same failure twice
+    if getattr(func, "__screenshot_on_failure__", False):
+        return func
+
+    # Fixture names are fixed by the test signature: pick the page fixture once per
+    # function (stashed on it, and copied onto the wrapper by _shallow_wraps)
+    page_kwarg = getattr(func, "__screenshot_page_kwarg__", _MISSING)
+    if page_kwarg is _MISSING:
+        page_kwarg = next(
+            (name for name in inspect.signature(func).parameters if _is_page_fixture_name(name)),
+            None
+        )
+        func.__screenshot_page_kwarg__ = page_kwarg
+
+    def find_page(kwargs):
+        """Resolve the page from the test's fixtures; scans kwargs only if the fast path misses"""
+        if page_kwarg in kwargs:
+            page, page_source = _page_from_fixture(page_kwarg, kwargs[page_kwarg])
+            if page is not None:
+                return page, page_source
         for key, value in kwargs.items():
-            try:
-                # Check if this is the 'app' fixture with a page attribute
-                if key == "app" and hasattr(value, "page"):
-                    page = value.page
-                    page_source = f"app fixture"
-                    break
-                
-                # Check if this is a page object fixture (ends with '_page')
-                elif key.endswith("_page") and hasattr(value, "page"):
-                    page = value.page
-                    page_source = f"{key} fixture"
-                    break
-                
-                # Check if this is the raw Playwright 'page' fixture
-                elif key == "page":
-                    page = value
-                    page_source = f"page fixture"
-                    break
-                    
-            except Exception:
-                continue
-        
+            if _is_page_fixture_name(key):
+                page, page_source = _page_from_fixture(key, value)
+                if page is not None:
+                    return page, page_source
+        return None, None
+
+    @_shallow_wraps(func)
+    async def wrapper(*args, **kwargs):
         try:
             # Run the actual test function
             return await func(*args, **kwargs)
         except Exception as exc:
+            # Only failures need the page, so the passing path does no lookup at all
+            request = kwargs.get('request')
+            page, page_source = find_page(kwargs)
+            
             # Test failed - attempt to capture screenshot if enabled
             if os.getenv("AI_HEALING_ENABLED", "false").lower() == "true":
                 #print("AI healing is enabled; skipping regular screenshot capture.") #broken, always takes screenshot
                 pass
-            elif page and os.getenv("SKIP_SCREENSHOTS", "0") != "1":
+            elif page:
                 try:
-                    screenshot_dir = SCREENSHOT_DIR
-                    screenshot_dir.mkdir(exist_ok=True)
-                    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                    global _screenshot_dir_ready
+                    if _PERSIST_SCREENSHOTS and not _screenshot_dir_ready:
+                        SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
+                        _screenshot_dir_ready = True
+                    timestamp = time.strftime(_TIMESTAMP_FORMAT)
                     
                     # Use function name or request nodeid if available
                     if request:
-                        test_name = request.node.nodeid.replace("/", "_").replace("::", "_")
+                        test_name = (getattr(request.node, "_screenshot_name", None)
+                                     or screenshot_test_name(request.node.nodeid))
                     else:
                         test_name = func.__name__
                     
-                    screenshot_path = screenshot_dir / f"{test_name}_{timestamp}.png"
+                    screenshot_name = test_name + "_" + timestamp + "_" + str(next(_SEQ)) + _EXTENSION
+                    screenshot_path = _SCREENSHOT_DIR_STR + screenshot_name
                     
-                    # Capture the screenshot
-                    await page.screenshot(path=str(screenshot_path), full_page=True)
+                    # Capture to memory; the file write (if kept) runs off the event loop
+                    image = await _capture_full_page(page)
+                    write = asyncio.ensure_future(asyncio.to_thread(_write_file, screenshot_path, image)) \
+                        if _PERSIST_SCREENSHOTS else None
                     
-                    # Attach screenshot to Allure report
-                    allure.attach.file(
-                        str(screenshot_path),
+                    # Attach the same bytes to Allure (no re-read of the file) while the write runs.
+                    # The attach itself stays on this thread: allure-commons tracks the current
+                    # test per thread, and a reused executor thread could attach to a stale test
+                    allure.attach(
+                        image,
                         name="Screenshot on Failure",
-                        attachment_type=allure.attachment_type.PNG
+                        attachment_type=_ATTACHMENT_TYPE
                     )
+                    if write is not None:
+                        await write
                     
-                    print(f"Screenshot saved and attached to Allure: {screenshot_path}")
+                    if _PERSIST_SCREENSHOTS:
+                        logger.info("Screenshot saved and attached to Allure: %s", screenshot_path)
+                    else:
+                        logger.info("Screenshot attached to Allure: %s", screenshot_name)
                     #print(f"Page object found via: {page_source}")
                     
                 except Exception as screenshot_error:
-                    print(f"Failed to capture screenshot: {screenshot_error}")
+                    logger.warning("Failed to capture screenshot: %s", screenshot_error)
             
             elif not page:
-                available_fixtures = list(kwargs.keys())
-                print(f"No page object found for screenshot. Available fixtures: {available_fixtures}")
+                logger.warning("No page object found for screenshot. Available fixtures: %s", list(kwargs))
             
             # Re-raise the original test exception
             raise exc
     
+    wrapper.__screenshot_on_failure__ = True
     return wrapper
@@ -8,14 +8,23 @@ applications meet modern performance standards.
 
 Features:
     ✓ Page load time measurement via Navigation Timing API
-    ✓ Core Web Vitals collection (LCP, FID, CLS, FCP)
+    ✓ Core Web Vitals collection (LCP, FID, CLS, FCP) with buffered observers, so early entries are kept
     ✓ Resource usage metrics (CPU, memory, network requests, bytes transferred)
-    ✓ JSON and CSV export of metrics for analysis
+    ✓ JSON and CSV export of metrics for analysis (buffered, flushed once per session)
     ✓ Clean summary printing with pass/fail thresholds
     ✓ Context manager for easy integration with tests
-    ✓ Tracking and averaging of metrics across multiple runs
+    ✓ Parallel multi-URL measurement, one context per URL (measure_many)
+    ✓ Tracking and averaging of metrics across multiple runs (columnar SoA store)
+    ✓ NumPy column reductions for averages and percentiles (p50/p75/p95)
     ✓ SPA route change detection and measurement
     ✓ Current page measurement without navigation
+    ✓ SPA measurements drain a persistent observer buffer instead of re-arming observers
+    ✓ Timing, vitals and resource metrics collected in a single evaluate round-trip
+      (script generated per monitor: PerformanceMonitorAsync(metrics={"lcp", "cls"}) skips the rest)
+    ✓ JS heap sizes from CDP on Chromium: the pushed Performance.metrics event triggered by the
+      collect evaluate, falling back to Performance.getMetrics
+      (optionally after a forced GC: PerformanceMonitorAsync(stabilize_heap=True))
+    ✓ Settling by request quiescence (≤2 in flight for 200 ms) instead of networkidle
 
 Usage:
     # In your async test file
@@ -27,26 +36,35 @@ Usage:
 Dependencies:
     - playwright.async_api: Async Playwright Page and Browser
     - dataclasses: Structured performance metrics container
-    - json / csv: Report serialization
+    - orjson / csv: Report serialization
+    - numpy: Column averages and percentiles
     - pathlib: File management and output directories
 
 Author: PMAC
 Date: [2025-08-18]
 """
 
-import json
+import asyncio
+import itertools
 import time
+import weakref
 import csv
+import re
+import numpy as np
+import orjson
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from datetime import datetime, timezone
 from playwright.async_api import Page
+# SPA route-change helpers live in route_change; re-exported here for existing imports
+from utils.route_change import arm_route_change, measure_after_spa_route_change, wait_for_route_change
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
-    """Data class to store performance metrics"""
+    """Data class to store performance metrics (slotted: no per-instance __dict__)"""
     url: str
     timestamp: float
     page_load_time: Optional[float] = None
@@ -63,103 +81,451 @@ class PerformanceMetrics:
     total_bytes_transferred: Optional[int] = None
 
 
-class PerformanceMonitorAsync:
+# Write buffer for CSV exports
+CSV_WRITE_BUFFER = 1 << 20
+
+# Column order for the SoA store and for JSON/CSV exports
+METRIC_FIELDS = tuple(f.name for f in fields(PerformanceMetrics))
+
+# Columns that hold numbers (everything but the URL label)
+NUMERIC_FIELDS = tuple(name for name in METRIC_FIELDS if name != "url")
+
+
+# Web Vitals observers injected by inject_web_vitals_script
+# Running resource count/bytes, so collectors read two numbers instead of scanning
+# every resource entry; guarded separately so it also runs beside enhanced_page's observers
+RESOURCE_TOTALS_JS = """
+(function () {
+if (window.__resourceTotals) return;
+const totals = window.__resourceTotals = {count: 0, bytes: 0};
+try {
+    new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) {
+            totals.count++;
+            totals.bytes += entry.transferSize || 0;
+        }
+    }).observe({type: 'resource', buffered: true});
+} catch (e) {
+    delete window.__resourceTotals;
+}
+})();
+"""
+
+_WEB_VITALS_JS = """
+// Web Vitals collection script; skipped if observers are already installed
+// (e.g. by enhanced_page's buffered observers)
+(function () {
+if (window.__webVitalsInstalled) return;
+window.__webVitalsInstalled = true;
+window.webVitalsData = {
+    lcp: null,
+    fid: null,
+    cls: null,
+    fcp: null
+};
+
+// Simplified Web Vitals implementation
+function observeLCP() {
+    const observer = new PerformanceObserver((list) => {
+        const entries = list.getEntries();
+        const lastEntry = entries[entries.length - 1];
+        window.webVitalsData.lcp = lastEntry.startTime;
+    });
+    observer.observe({type: 'largest-contentful-paint', buffered: true});
+}
+
+function observeFCP() {
+    const observer = new PerformanceObserver((list) => {
+        const entries = list.getEntries();
+        for (const entry of entries) {
+            if (entry.name === 'first-contentful-paint') {
+                window.webVitalsData.fcp = entry.startTime;
+            }
+        }
+    });
+    observer.observe({type: 'paint', buffered: true});
+}
+
+function observeCLS() {
+    let clsValue = 0;
+    const observer = new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) {
+            if (!entry.hadRecentInput) {
+                clsValue += entry.value;
+            }
+        }
+        window.webVitalsData.cls = clsValue;
+    });
+    observer.observe({type: 'layout-shift', buffered: true});
+}
+
+function observeFID() {
+    const observer = new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) {
+            window.webVitalsData.fid = entry.processingStart - entry.startTime;
+        }
+    });
+    observer.observe({type: 'first-input', buffered: true});
+}
+
+// Start observing right away; buffered delivery replays entries emitted before now
+observeLCP();
+observeFCP();
+observeCLS();
+observeFID();
+})();
+""" + RESOURCE_TOTALS_JS
+
+# Comment lines dropped and whitespace collapsed once at import: a smaller init
+# script to ship over CDP for every page (the script has no strings containing //)
+_WEB_VITALS_JS_MIN = re.sub(r"\s+", " ", re.sub(r"^\s*//[^\n]*$", "", _WEB_VITALS_JS, flags=re.MULTILINE)).strip()
+
+
+# Blocks of the fused collect script, one per metric group; _build_collect_js
+# emits only the requested ones so unused metrics cost neither JS work nor payload
+_COLLECT_JS_BLOCKS = {
+    "navigation": """
+            // Navigation entry timestamps are high-resolution and relative to the
+            // navigation start (0), so they are durations already
+            const n = performance.getEntriesByType('navigation')[0] || {};
+            out.navigationTiming = {
+                domContentLoadedEventEnd: n.domContentLoadedEventEnd,
+                loadEventEnd: n.loadEventEnd,
+                responseStart: n.responseStart,
+                domComplete: n.domComplete,
+                timeToFirstByte: n.responseStart
+            };""",
+    "lcp": "\n            out.webVitals.lcp = vitals.lcp;",
+    "fcp": "\n            out.webVitals.fcp = vitals.fcp;",
+    "cls": "\n            out.webVitals.cls = vitals.cls;",
+    "fid": "\n            out.webVitals.fid = vitals.fid;",
+    "resources": """
+            let totals = window.__resourceTotals;
+            if (!totals) {
+                // Page without the init script: fall back to scanning the entries
+                totals = {count: 0, bytes: 0};
+                for (const entry of performance.getEntriesByType('resource')) {
+                    totals.count++;
+                    totals.bytes += entry.transferSize || 0;
+                }
+            }
+            out.resourceMetrics.resourceCount = totals.count;
+            out.resourceMetrics.totalBytesTransferred = totals.bytes;""",
+    "heap": """
+            // console.timeStamp makes Chromium push a Performance.metrics event over CDP,
+            // titled with this call's stamp so the listener can match it to this sample
+            if (stamp && console.timeStamp) console.timeStamp(stamp);
+            out.resourceMetrics.jsHeapUsedSize = performance.memory ? performance.memory.usedJSHeapSize : null;
+            out.resourceMetrics.jsHeapTotalSize = performance.memory ? performance.memory.totalJSHeapSize : null;""",
+}
+
+# Metric groups a PerformanceMonitorAsync can be restricted to (default: all)
+COLLECTABLE_METRICS = frozenset(_COLLECT_JS_BLOCKS)
+
+
+@lru_cache(maxsize=None)
+def _build_collect_js(want: frozenset) -> str:
+    """
+    Generate the fused collect function for a set of metric groups (see COLLECTABLE_METRICS).
+    Blocks are emitted in _COLLECT_JS_BLOCKS order; sections that end up empty stay {}.
+    The function takes an optional timeStamp title used by the heap block.
+    """
+    unknown = want - COLLECTABLE_METRICS
+    if unknown:
+        raise ValueError(f"Unknown metric group(s): {', '.join(sorted(unknown))}")
+    body = "".join(block for name, block in _COLLECT_JS_BLOCKS.items() if name in want)
+    return (
+        "(stamp) => {\n"
+        "            const out = {navigationTiming: {}, webVitals: {}, resourceMetrics: {}};\n"
+        "            const vitals = window.webVitalsData || {};"
+        f"{body}\n"
+        "            return out;\n"
+        "        }"
+    )
+
+
+class _NetworkTracker:
+    """
+    Counts a page's in-flight requests from its request/requestfinished/requestfailed
+    events, so callers can wait for "few requests in flight for a short while"
+    instead of Playwright's networkidle (no requests at all for 500 ms).
+    """
+
+    def __init__(self, page: Page):
+        self.inflight = 0
+        # Set per wait_quiet call; _quiet_since is when inflight last dropped to <= _max_inflight
+        # (None while above it). Only crossings of that threshold wake the waiter.
+        self._max_inflight = 0
+        self._quiet_since = None
+        self._changed = asyncio.Event()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    def _started(self, _request) -> None:
+        self.inflight += 1
+        if self.inflight > self._max_inflight and self._quiet_since is not None:
+            self._quiet_since = None
+            self._changed.set()
+
+    def _finished(self, _request) -> None:
+        # Requests that started before the tracker was attached finish uncounted
+        self.inflight = max(0, self.inflight - 1)
+        if self.inflight <= self._max_inflight and self._quiet_since is None:
+            self._quiet_since = time.monotonic()
+            self._changed.set()
+
+    async def wait_quiet(self, max_inflight: int, quiet_ms: int, timeout_ms: int) -> bool:
+        """
+        True once at most max_inflight requests stayed in flight for quiet_ms; False on timeout.
+        Requests that start and finish without exceeding max_inflight (polling, beacons)
+        do not restart the quiet window.
+        """
+        self._max_inflight = max_inflight
+        now = time.monotonic()
+        self._quiet_since = now if self.inflight <= max_inflight else None
+        deadline = now + timeout_ms / 1000
+        quiet_s = quiet_ms / 1000
+        while True:
+            now = time.monotonic()
+            if self._quiet_since is not None and now - self._quiet_since >= quiet_s:
+                return True
+            remaining = deadline - now
+            if remaining <= 0:
+                return False
+            window = remaining if self._quiet_since is None else self._quiet_since + quiet_s - now
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), min(window, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+
+# Summary layout: (section header, rows of (field, label, format, scale, (good, poor) thresholds))
+_SUMMARY_SECTIONS = (
+    (None, (
+        ("page_load_time", "📊 Page Load Time", "{:.2f} ms", 1, None),
+        ("dom_content_loaded", "🏗️  DOM Content Loaded", "{:.2f} ms", 1, None),
+        ("time_to_first_byte", "⚡ Time to First Byte", "{:.2f} ms", 1, None),
+    )),
+    ("\n🎯 Core Web Vitals:", (
+        ("largest_contentful_paint", "   LCP", "{:.2f} ms", 1, (2500, 4000)),
+        ("first_input_delay", "   FID", "{:.2f} ms", 1, (100, 300)),
+        ("cumulative_layout_shift", "   CLS", "{:.3f}", 1, (0.1, 0.25)),
+        ("first_contentful_paint", "   FCP", "{:.2f} ms", 1, None),
+    )),
+    ("\n💾 Resource Usage:", (
+        ("js_heap_used_size", "   JS Heap Used", "{:.2f} MB", 1 / 1024 / 1024, None),
+        ("network_requests", "   Network Requests", "{}", 1, None),
+        ("total_bytes_transferred", "   Total Bytes", "{:.2f} KB", 1 / 1024, None),
+    )),
+)
+
+
+def _rate(value: float, thresholds: tuple) -> str:
+    """Core Web Vitals rating for a value against its (good, poor) thresholds"""
+    good, poor = thresholds
+    return "✅ Good" if value <= good else "⚠️ Needs Improvement" if value <= poor else "❌ Poor"
+
+
+class MetricsStore:
+    """
+    Columnar (structure-of-arrays) storage for PerformanceMetrics.
+    Each field lives in its own list under self.columns, so summary stats and
+    budget checks scan one contiguous column instead of every record.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, list] = {name: [] for name in METRIC_FIELDS}
+
+    def record(self, metrics: PerformanceMetrics) -> PerformanceMetrics:
+        """Append one measurement to every column"""
+        for name in METRIC_FIELDS:
+            self.columns[name].append(getattr(metrics, name))
+        return metrics
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Measurements as row dicts, in METRIC_FIELDS order"""
+        return [dict(zip(METRIC_FIELDS, row)) for row in zip(*self.columns.values())]
+
+    @property
+    def metrics_history(self) -> List[PerformanceMetrics]:
+        """Measurements rebuilt as PerformanceMetrics records (read-only view)"""
+        return [PerformanceMetrics(*row) for row in zip(*self.columns.values())]
+
+    def _numeric_columns(self):
+        """Yield (name, float64 array) per numeric column with at least one value; None -> NaN"""
+        for name in NUMERIC_FIELDS:
+            column = np.array(self.columns[name], dtype=np.float64)
+            if column.size and not np.isnan(column).all():
+                yield name, column
+
+    def get_average_metrics(self) -> Dict[str, float]:
+        """Calculate average metrics across all measurements"""
+        return {name: float(np.nanmean(column)) for name, column in self._numeric_columns()}
+
+    def get_percentile_metrics(self, p: float = 50) -> Dict[str, float]:
+        """Calculate the p-th percentile (e.g. 50, 75, 95) of each metric across all measurements"""
+        return {name: float(np.nanpercentile(column, p)) for name, column in self._numeric_columns()}
+
+    def extend(self, other: "MetricsStore") -> None:
+        """Append every measurement held by another store"""
+        for name in METRIC_FIELDS:
+            self.columns[name].extend(other.columns[name])
+
+    def clear_metrics(self) -> None:
+        """Clear collected metrics history"""
+        for column in self.columns.values():
+            column.clear()
+
+
+class PerformanceMonitorAsync(MetricsStore):
     """Async performance monitoring utility for Playwright tests"""
+
+    # Real collection; the conftest DummyMonitor sets this False
+    enabled = True
     
-    def __init__(self, output_dir: str = "performance_reports"):
+    def __init__(self, output_dir: str = "performance_reports", stabilize_heap: bool = False,
+                 metrics: Optional[set] = None):
+        super().__init__()
+        # Metric groups collect_all gathers (COLLECTABLE_METRICS names); the script is specialized once
+        self.metrics = frozenset(metrics) if metrics is not None else COLLECTABLE_METRICS
+        self._fused_js = _build_collect_js(self.metrics)
+        # Force a GC through CDP before reading heap sizes, for less noisy samples (Chromium only)
+        self.stabilize_heap = stabilize_heap
+        # Page -> CDP session (or None off Chromium); entries go away with their pages
+        self._cdp_sessions = weakref.WeakKeyDictionary()
+        # Page -> {"expect": stamp, "metrics": ...} for the pushed Performance.metrics
+        # event of the pending collect_all; events with any other title are dropped
+        self._pushed_cdp_metrics = weakref.WeakKeyDictionary()
+        self._stamp_seq = itertools.count()
+        # Pages that already carry the web-vitals init script
+        self._vitals_injected = weakref.WeakSet()
+        # Page -> _NetworkTracker of its in-flight requests
+        self._network_trackers = weakref.WeakKeyDictionary()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
-        self.metrics_history: List[PerformanceMetrics] = []
+        # Report filenames share one run stamp plus a sequence number, instead of a strftime per save
+        self._run_stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        self._file_seq = itertools.count()
         
     async def inject_web_vitals_script(self, page: Page) -> None:
-        """Inject web-vitals library and setup collectors"""
-        web_vitals_script = """
-        // Web Vitals collection script
-        window.webVitalsData = {
-            lcp: null,
-            fid: null,
-            cls: null,
-            fcp: null
-        };
-        
-        // Simplified Web Vitals implementation
-        function observeLCP() {
-            const observer = new PerformanceObserver((list) => {
-                const entries = list.getEntries();
-                const lastEntry = entries[entries.length - 1];
-                window.webVitalsData.lcp = lastEntry.startTime;
-            });
-            observer.observe({entryTypes: ['largest-contentful-paint']});
-        }
-        
-        function observeFCP() {
-            const observer = new PerformanceObserver((list) => {
-                const entries = list.getEntries();
-                for (const entry of entries) {
-                    if (entry.name === 'first-contentful-paint') {
-                        window.webVitalsData.fcp = entry.startTime;
-                    }
-                }
-            });
-            observer.observe({entryTypes: ['paint']});
-        }
-        
-        function observeCLS() {
-            let clsValue = 0;
-            const observer = new PerformanceObserver((list) => {
-                for (const entry of list.getEntries()) {
-                    if (!entry.hadRecentInput) {
-                        clsValue += entry.value;
-                    }
-                }
-                window.webVitalsData.cls = clsValue;
-            });
-            observer.observe({entryTypes: ['layout-shift']});
-        }
-        
-        function observeFID() {
-            const observer = new PerformanceObserver((list) => {
-                for (const entry of list.getEntries()) {
-                    window.webVitalsData.fid = entry.processingStart - entry.startTime;
-                }
-            });
-            observer.observe({entryTypes: ['first-input']});
-        }
-        
-        // Start observing
-        if (document.readyState === 'loading') {
-            document.addEventListener('DOMContentLoaded', () => {
-                observeLCP();
-                observeFCP();
-                observeCLS();
-                observeFID();
-            });
-        } else {
-            observeLCP();
-            observeFCP();
-            observeCLS();
-            observeFID();
-        }
         """
-        await page.add_init_script(web_vitals_script)
+        Inject web-vitals library and setup collectors. Init scripts persist for
+        every later document of the page, so each page is only injected once.
+        """
+        if page in self._vitals_injected:
+            return
+        self._vitals_injected.add(page)
+
+        await page.add_init_script(_WEB_VITALS_JS_MIN)
     
+    # Navigation timing, web vitals and resource metrics in one evaluate round-trip
+    _COLLECT_ALL_JS = _build_collect_js(COLLECTABLE_METRICS)
+
+    # Blink counters read via CDP Performance.getMetrics -> resourceMetrics keys
+    _CDP_METRIC_KEYS = {"JSHeapUsedSize": "jsHeapUsedSize", "JSHeapTotalSize": "jsHeapTotalSize"}
+
+    async def _get_cdp_session(self, page: Page):
+        """
+        CDP session with the Performance domain enabled, opened once per page.
+        None on browsers without CDP (Firefox/WebKit).
+        """
+        if page not in self._cdp_sessions:
+            try:
+                session = await page.context.new_cdp_session(page)
+                # Holder dict rather than a closure over page, so the weak keys can still expire
+                pushed = self._pushed_cdp_metrics[page] = {}
+                session.on("Performance.metrics", lambda event: self._on_pushed_metrics(pushed, event))
+                await session.send("Performance.enable")
+            except Exception:
+                session = None
+            self._cdp_sessions[page] = session
+        return self._cdp_sessions[page]
+
+    @staticmethod
+    def _on_pushed_metrics(pushed: Dict[str, Any], event: Dict[str, Any]) -> None:
+        """Keep a pushed Performance.metrics event only if it carries the awaited stamp"""
+        if "expect" in pushed and event.get("title") == pushed["expect"]:
+            pushed["metrics"] = event.get("metrics")
+
+    async def collect_cdp_metrics(self, page: Page, use_pushed: bool = False) -> Dict[str, Any]:
+        """
+        Read JS heap sizes from Blink's internal counters (Chromium only).
+        Unlike performance.memory these are exact and need no JS execution.
+        With use_pushed, takes the snapshot pushed during the collect evaluate that
+        just ran, so no extra round-trip; if that event has not arrived yet (events
+        are not ordered with the evaluate reply) it polls Performance.getMetrics.
+        """
+        session = await self._get_cdp_session(page)
+        if session is None:
+            return {}
+        keys = self._CDP_METRIC_KEYS
+        pushed = self._pushed_cdp_metrics.get(page)
+        snapshot = None
+        if pushed is not None:
+            # Stop awaiting this stamp, so a late event cannot leak into the next sample
+            pushed.pop("expect", None)
+            snapshot = pushed.pop("metrics", None)
+        result = {"metrics": snapshot} if use_pushed and snapshot and not self.stabilize_heap else None
+        try:
+            if self.stabilize_heap:
+                before = await session.send("Performance.getMetrics")
+                await session.send("HeapProfiler.collectGarbage")
+            if result is None:
+                result = await session.send("Performance.getMetrics")
+        except Exception:
+            return {}
+        metrics = {keys[m["name"]]: m["value"] for m in result.get("metrics", ()) if m["name"] in keys}
+        if self.stabilize_heap:
+            used_before = next((m["value"] for m in before.get("metrics", ()) if m["name"] == "JSHeapUsedSize"), None)
+            if used_before is not None and "jsHeapUsedSize" in metrics:
+                freed = (used_before - metrics["jsHeapUsedSize"]) / 1024 / 1024
+                print(f"🧹 GC before heap sample freed {freed:.2f} MB")
+        return metrics
+
+    async def collect_all(self, page: Page) -> Dict[str, Any]:
+        """Collect navigation timing, web vitals and resource metrics in a single evaluate"""
+        if "heap" not in self.metrics:
+            return await page.evaluate(self._fused_js)
+        # Session (and its Performance.metrics listener) must exist before the evaluate pushes
+        await self._get_cdp_session(page)
+        stamp = f"perf-monitor-{next(self._stamp_seq)}"
+        pushed = self._pushed_cdp_metrics.get(page)
+        if pushed is not None:
+            pushed.clear()
+            pushed["expect"] = stamp
+        data = await page.evaluate(self._fused_js, stamp)
+        data['resourceMetrics'].update(await self.collect_cdp_metrics(page, use_pushed=True))
+        return data
+
+    @staticmethod
+    def _build_metrics(url: str, timestamp: float, data: Dict[str, Any]) -> PerformanceMetrics:
+        """Derive a PerformanceMetrics record from the collect_all() payload"""
+        navigation_timing = data.get('navigationTiming') or {}
+        web_vitals = data.get('webVitals') or {}
+        resource_metrics = data.get('resourceMetrics') or {}
+
+        # Origin-relative already; 0 means the event has not happened yet
+        return PerformanceMetrics(
+            url=url,
+            timestamp=timestamp,
+            page_load_time=navigation_timing.get('loadEventEnd') or None,
+            dom_content_loaded=navigation_timing.get('domContentLoadedEventEnd') or None,
+            first_contentful_paint=web_vitals.get('fcp'),
+            largest_contentful_paint=web_vitals.get('lcp'),
+            first_input_delay=web_vitals.get('fid'),
+            cumulative_layout_shift=web_vitals.get('cls'),
+            time_to_first_byte=navigation_timing.get('timeToFirstByte') or None,
+            js_heap_used_size=resource_metrics.get('jsHeapUsedSize'),
+            js_heap_total_size=resource_metrics.get('jsHeapTotalSize'),
+            network_requests=resource_metrics.get('resourceCount'),
+            total_bytes_transferred=resource_metrics.get('totalBytesTransferred'),
+        )
+
     async def collect_navigation_timing(self, page: Page) -> Dict[str, Any]:
         """Collect navigation timing metrics"""
-        return await page.evaluate("""
-            () => {
-                const timing = performance.timing;
-                const navigation = performance.getEntriesByType('navigation')[0];
-                
-                return {
-                    navigationStart: timing.navigationStart,
-                    domContentLoadedEventEnd: timing.domContentLoadedEventEnd,
-                    loadEventEnd: timing.loadEventEnd,
-                    responseStart: timing.responseStart,
-                    domComplete: timing.domComplete,
-                    timeToFirstByte: navigation ? navigation.responseStart : null
-                };
-            }
-        """)
+        return (await page.evaluate(self._COLLECT_ALL_JS))['navigationTiming']
     
     async def collect_web_vitals(self, page: Page) -> Dict[str, Any]:
         """Collect Web Vitals metrics"""
@@ -168,27 +534,48 @@ class PerformanceMonitorAsync:
     async def collect_resource_metrics(self, page: Page) -> Dict[str, Any]:
         """Collect resource usage metrics"""
         try:
-            # Get Playwright's built-in metrics (Chrome only)
-            metrics = await page.evaluate("""
-                () => {
-                    const entries = performance.getEntriesByType('resource');
-                    const totalBytes = entries.reduce((sum, entry) => {
-                        return sum + (entry.transferSize || 0);
-                    }, 0);
-                    
-                    return {
-                        resourceCount: entries.length,
-                        totalBytesTransferred: totalBytes,
-                        jsHeapUsedSize: performance.memory ? performance.memory.usedJSHeapSize : null,
-                        jsHeapTotalSize: performance.memory ? performance.memory.totalJSHeapSize : null
-                    };
-                }
-            """)
+            # Counts/bytes from the running totals (scan fallback); heap sizes from CDP when available
+            metrics = (await page.evaluate(self._COLLECT_ALL_JS))['resourceMetrics']
+            metrics.update(await self.collect_cdp_metrics(page))
             return metrics
         except Exception as e:
             print(f"Warning: Could not collect resource metrics: {e}")
             return {}
     
+    def _network_tracker(self, page: Page) -> _NetworkTracker:
+        """In-flight request counter for the page, attached on first use"""
+        tracker = self._network_trackers.get(page)
+        if tracker is None:
+            tracker = self._network_trackers[page] = _NetworkTracker(page)
+        return tracker
+
+    async def wait_for_network_quiet(self, page: Page, max_inflight: int = 2,
+                                     quiet_ms: int = 200, timeout: int = 5000) -> bool:
+        """
+        Wait until at most max_inflight requests have been in flight for quiet_ms.
+        Unlike networkidle this tolerates analytics/long-poll traffic and has no
+        fixed 500 ms floor. Falls back to the 'load' state on timeout.
+        """
+        if await self._network_tracker(page).wait_quiet(max_inflight, quiet_ms, timeout):
+            return True
+        await page.wait_for_load_state("load")
+        return False
+
+    async def wait_for_vitals(self, page: Page, timeout: int = 2000) -> bool:
+        """
+        Wait until the observers have reported LCP, the last Core Web Vital to settle
+        (FCP and layout shifts precede it). Returns False on timeout, e.g. for pages
+        that never produce an LCP entry, so callers simply measure what is there.
+        """
+        try:
+            await page.wait_for_function(
+                "() => window.webVitalsData && window.webVitalsData.lcp != null",
+                timeout=timeout
+            )
+            return True
+        except Exception:
+            return False
+
     async def measure_current_page(self, page: Page, label: Optional[str] = None) -> PerformanceMetrics:
         """
         Measure performance for the currently loaded page without triggering a new navigation.
@@ -196,54 +583,80 @@ class PerformanceMonitorAsync:
         """
         timestamp = time.time()
 
-        # Safe to call multiple times; ensures the vitals observers are present
+        # Injects once per page; later calls are a set lookup
         await self.inject_web_vitals_script(page)
 
-        # Give the page a moment to settle (network idle + small delay)
-        try:
-            await page.wait_for_load_state("networkidle")
-        except Exception:
-            # Some apps never reach 'networkidle'; fall back to 'load'
-            await page.wait_for_load_state("load")
-        await page.wait_for_timeout(500)
-
-        navigation_timing = await self.collect_navigation_timing(page)
-        web_vitals = await self.collect_web_vitals(page)
-        resource_metrics = await self.collect_resource_metrics(page)
-
-        # Derive metrics
-        page_load_time = None
-        dom_content_loaded = None
-        time_to_first_byte = None
+        # Give the page a moment to settle (request quiescence, then LCP)
+        await self.wait_for_network_quiet(page)
+        await self.wait_for_vitals(page, timeout=500)
 
-        if navigation_timing.get('navigationStart') and navigation_timing.get('loadEventEnd'):
-            page_load_time = navigation_timing['loadEventEnd'] - navigation_timing['navigationStart']
+        data = await self.collect_all(page)
+        metrics = self._build_metrics(label or page.url, timestamp, data)
 
-        if navigation_timing.get('navigationStart') and navigation_timing.get('domContentLoadedEventEnd'):
-            dom_content_loaded = navigation_timing['domContentLoadedEventEnd'] - navigation_timing['navigationStart']
-
-        if navigation_timing.get('timeToFirstByte'):
-            time_to_first_byte = navigation_timing['timeToFirstByte']
+        return self.record(metrics)
+    
+    async def drain_observed_entries(self, page: Page, label: Optional[str] = None) -> Optional[PerformanceMetrics]:
+        """
+        Drain the entries queued by the persistent observers that enhanced_page
+        installs (window.__perfBuf) and record them as one measurement.
+        Everything is reduced in-page, so this is a single evaluate round-trip.
+        Returns None when the page has no buffer; callers should then fall back
+        to measure_current_page.
+        """
+        timestamp = time.time()
+        drained = await page.evaluate("""
+            () => {
+                if (!window.__perfBuf) return null;
+                const entries = window.__perfBuf.splice(0);
+                const out = { lcp: null, fcp: null, fid: null, cls: 0, nav: null };
+                for (const e of entries) {
+                    if (e.entryType === 'largest-contentful-paint') out.lcp = e.startTime;
+                    else if (e.entryType === 'paint' && e.name === 'first-contentful-paint') out.fcp = e.startTime;
+                    else if (e.entryType === 'layout-shift' && !e.hadRecentInput) out.cls += e.value;
+                    else if (e.entryType === 'first-input') out.fid = e.processingStart - e.startTime;
+                    else if (e.entryType === 'navigation') out.nav = {
+                        loadEventEnd: e.loadEventEnd,
+                        domContentLoadedEventEnd: e.domContentLoadedEventEnd,
+                        responseStart: e.responseStart
+                    };
+                }
+                const totals = window.__resourceTotals;
+                if (totals) {
+                    out.resourceCount = totals.count;
+                    out.totalBytesTransferred = totals.bytes;
+                } else {
+                    const resources = performance.getEntriesByType('resource');
+                    out.resourceCount = resources.length;
+                    out.totalBytesTransferred = resources.reduce((sum, r) => sum + (r.transferSize || 0), 0);
+                }
+                out.jsHeapUsedSize = performance.memory ? performance.memory.usedJSHeapSize : null;
+                out.jsHeapTotalSize = performance.memory ? performance.memory.totalJSHeapSize : null;
+                return out;
+            }
+        """)
+        if drained is None:
+            return None
 
+        # Navigation entries only appear in the first drain after a document load
+        nav = drained.get('nav') or {}
         metrics = PerformanceMetrics(
             url=label or page.url,
             timestamp=timestamp,
-            page_load_time=page_load_time,
-            dom_content_loaded=dom_content_loaded,
-            first_contentful_paint=web_vitals.get('fcp'),
-            largest_contentful_paint=web_vitals.get('lcp'),
-            first_input_delay=web_vitals.get('fid'),
-            cumulative_layout_shift=web_vitals.get('cls'),
-            time_to_first_byte=time_to_first_byte,
-            js_heap_used_size=resource_metrics.get('jsHeapUsedSize'),
-            js_heap_total_size=resource_metrics.get('jsHeapTotalSize'),
-            network_requests=resource_metrics.get('resourceCount'),
-            total_bytes_transferred=resource_metrics.get('totalBytesTransferred'),
+            page_load_time=nav.get('loadEventEnd') or None,
+            dom_content_loaded=nav.get('domContentLoadedEventEnd') or None,
+            first_contentful_paint=drained.get('fcp'),
+            largest_contentful_paint=drained.get('lcp'),
+            first_input_delay=drained.get('fid'),
+            cumulative_layout_shift=drained.get('cls'),
+            time_to_first_byte=nav.get('responseStart') or None,
+            js_heap_used_size=drained.get('jsHeapUsedSize'),
+            js_heap_total_size=drained.get('jsHeapTotalSize'),
+            network_requests=drained.get('resourceCount'),
+            total_bytes_transferred=drained.get('totalBytesTransferred'),
         )
 
-        self.metrics_history.append(metrics)
-        return metrics
-    
+        return self.record(metrics)
+
     async def measure_page_performance(self, page: Page, url: str) -> PerformanceMetrics:
         """Comprehensive performance measurement for a page with navigation"""
         timestamp = time.time()
@@ -251,55 +664,46 @@ class PerformanceMonitorAsync:
         # Inject Web Vitals script before navigation
         await self.inject_web_vitals_script(page)
         
-        # Navigate to the page
+        # Navigate to the page (tracker attached first so the navigation's requests count)
+        self._network_tracker(page)
         await page.goto(url)
-        await page.wait_for_load_state('networkidle')
+        await self.wait_for_network_quiet(page)
         
-        # Wait a bit for Web Vitals to be collected
-        await page.wait_for_timeout(2000)
+        # Wait for Web Vitals to be collected (returns as soon as LCP is reported)
+        await self.wait_for_vitals(page, timeout=2000)
         
-        # Collect all metrics
-        navigation_timing = await self.collect_navigation_timing(page)
-        web_vitals = await self.collect_web_vitals(page)
-        resource_metrics = await self.collect_resource_metrics(page)
+        # Collect all metrics in one round-trip
+        data = await self.collect_all(page)
+        metrics = self._build_metrics(url, timestamp, data)
         
-        # Calculate derived metrics
-        page_load_time = None
-        dom_content_loaded = None
-        time_to_first_byte = None
-        
-        if navigation_timing.get('navigationStart') and navigation_timing.get('loadEventEnd'):
-            page_load_time = navigation_timing['loadEventEnd'] - navigation_timing['navigationStart']
-        
-        if navigation_timing.get('navigationStart') and navigation_timing.get('domContentLoadedEventEnd'):
-            dom_content_loaded = navigation_timing['domContentLoadedEventEnd'] - navigation_timing['navigationStart']
-        
-        if navigation_timing.get('timeToFirstByte'):
-            time_to_first_byte = navigation_timing['timeToFirstByte']
-        
-        # Create metrics object
-        metrics = PerformanceMetrics(
-            url=url,
-            timestamp=timestamp,
-            page_load_time=page_load_time,
-            dom_content_loaded=dom_content_loaded,
-            first_contentful_paint=web_vitals.get('fcp'),
-            largest_contentful_paint=web_vitals.get('lcp'),
-            first_input_delay=web_vitals.get('fid'),
-            cumulative_layout_shift=web_vitals.get('cls'),
-            time_to_first_byte=time_to_first_byte,
-            js_heap_used_size=resource_metrics.get('jsHeapUsedSize'),
-            js_heap_total_size=resource_metrics.get('jsHeapTotalSize'),
-            network_requests=resource_metrics.get('resourceCount'),
-            total_bytes_transferred=resource_metrics.get('totalBytesTransferred')
-        )
-        
-        self.metrics_history.append(metrics)
-        return metrics
+        return self.record(metrics)
+
+    async def measure_many(self, browser, urls: List[str], concurrency: int = 4) -> List[PerformanceMetrics]:
+        """
+        Measure several URLs in parallel, each in its own fresh browser context.
+        At most `concurrency` contexts are open at once; results follow the order of `urls`.
+        record() is synchronous, so concurrent measurements append to the columns without a lock.
+        """
+        slots = asyncio.Semaphore(concurrency)
+
+        async def _measure_one(url: str) -> PerformanceMetrics:
+            async with slots:
+                context = await browser.new_context()
+                try:
+                    page = await context.new_page()
+                    return await self.measure_page_performance(page, url)
+                finally:
+                    await context.close()
+
+        return list(await asyncio.gather(*(_measure_one(url) for url in urls)))
     
-    def save_metrics_to_json(self, filename: str = None) -> str:
-        """Save collected metrics to JSON file with timestamp in filename"""
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    def _next_file_stamp(self) -> str:
+        """Run stamp plus the next sequence number, e.g. 20250818_101500_3"""
+        return f"{self._run_stamp}_{next(self._file_seq)}"
+
+    def save_metrics_to_json(self, filename: str = None, ts: str = None) -> str:
+        """Save collected metrics to JSON file with run stamp and sequence number in filename"""
+        ts = ts or self._next_file_stamp()
         if not filename:
             filename = f"performance_metrics_{ts}.json"
         else:
@@ -311,14 +715,14 @@ class PerformanceMonitorAsync:
         
         filepath = self.output_dir / filename
         
-        with open(filepath, 'w') as f:
-            json.dump([asdict(metric) for metric in self.metrics_history], f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(self.rows(), option=orjson.OPT_INDENT_2))
         
         return str(filepath)
     
-    def save_metrics_to_csv(self, filename: str = None) -> str:
-        """Save collected metrics to CSV file with timestamp in filename"""
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    def save_metrics_to_csv(self, filename: str = None, ts: str = None) -> str:
+        """Save collected metrics to CSV file with run stamp and sequence number in filename"""
+        ts = ts or self._next_file_stamp()
         if not filename:
             filename = f"performance_metrics_{ts}.csv"
         else:
@@ -330,77 +734,41 @@ class PerformanceMonitorAsync:
         
         filepath = self.output_dir / filename
         
-        if self.metrics_history:
-            with open(filepath, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=asdict(self.metrics_history[0]).keys())
-                writer.writeheader()
-                for metric in self.metrics_history:
-                    writer.writerow(asdict(metric))
+        if self.columns['url']:
+            # 1 MiB buffer so the rows go out in a single write
+            with open(filepath, 'w', newline='', buffering=CSV_WRITE_BUFFER) as f:
+                writer = csv.writer(f)
+                writer.writerow(METRIC_FIELDS)
+                writer.writerows(zip(*self.columns.values()))
         
         return str(filepath)
     
+    async def flush(self, filename: str) -> None:
+        """Write all buffered metrics to JSON and CSV in one go, off the event loop"""
+        # Both files of one flush carry the same suffix
+        ts = self._next_file_stamp()
+        await asyncio.gather(
+            asyncio.to_thread(self.save_metrics_to_json, filename, ts),
+            asyncio.to_thread(self.save_metrics_to_csv, filename, ts),
+        )
+
     def print_metrics_summary(self, metrics: PerformanceMetrics) -> None:
-        """Print a formatted summary of performance metrics"""
-        print(f"\n🚀 Performance Metrics for {metrics.url}")
-        print("=" * 60)
-        
-        if metrics.page_load_time:
-            print(f"📊 Page Load Time: {metrics.page_load_time:.2f} ms")
-        
-        if metrics.dom_content_loaded:
-            print(f"🏗️  DOM Content Loaded: {metrics.dom_content_loaded:.2f} ms")
-        
-        if metrics.time_to_first_byte:
-            print(f"⚡ Time to First Byte: {metrics.time_to_first_byte:.2f} ms")
-        
-        print("\n🎯 Core Web Vitals:")
-        if metrics.largest_contentful_paint:
-            lcp_status = "✅ Good" if metrics.largest_contentful_paint <= 2500 else "⚠️ Needs Improvement" if metrics.largest_contentful_paint <= 4000 else "❌ Poor"
-            print(f"   LCP: {metrics.largest_contentful_paint:.2f} ms ({lcp_status})")
-        
-        if metrics.first_input_delay:
-            fid_status = "✅ Good" if metrics.first_input_delay <= 100 else "⚠️ Needs Improvement" if metrics.first_input_delay <= 300 else "❌ Poor"
-            print(f"   FID: {metrics.first_input_delay:.2f} ms ({fid_status})")
-        
-        if metrics.cumulative_layout_shift is not None:
-            cls_status = "✅ Good" if metrics.cumulative_layout_shift <= 0.1 else "⚠️ Needs Improvement" if metrics.cumulative_layout_shift <= 0.25 else "❌ Poor"
-            print(f"   CLS: {metrics.cumulative_layout_shift:.3f} ({cls_status})")
-        
-        if metrics.first_contentful_paint:
-            print(f"   FCP: {metrics.first_contentful_paint:.2f} ms")
-        
-        print("\n💾 Resource Usage:")
-        if metrics.js_heap_used_size:
-            print(f"   JS Heap Used: {metrics.js_heap_used_size / 1024 / 1024:.2f} MB")
-        
-        if metrics.network_requests:
-            print(f"   Network Requests: {metrics.network_requests}")
-        
-        if metrics.total_bytes_transferred:
-            print(f"   Total Bytes: {metrics.total_bytes_transferred / 1024:.2f} KB")
-        
-        print("=" * 60)
-    
-    def get_average_metrics(self) -> Dict[str, float]:
-        """Calculate average metrics across all measurements"""
-        if not self.metrics_history:
-            return {}
-        
-        metrics_sum = {}
-        metrics_count = {}
-        
-        for metric in self.metrics_history:
-            for key, value in asdict(metric).items():
-                if isinstance(value, (int, float)) and value is not None:
-                    metrics_sum[key] = metrics_sum.get(key, 0) + value
-                    metrics_count[key] = metrics_count.get(key, 0) + 1
-        
-        return {key: metrics_sum[key] / metrics_count[key] 
-                for key in metrics_sum if metrics_count[key] > 0}
-    
-    def clear_metrics(self) -> None:
-        """Clear collected metrics history"""
-        self.metrics_history.clear()
+        """Print a formatted summary of performance metrics (one write, driven by _SUMMARY_SECTIONS)"""
+        lines = [f"\n🚀 Performance Metrics for {metrics.url}", "=" * 60]
+        for header, rows in _SUMMARY_SECTIONS:
+            if header:
+                lines.append(header)
+            for name, label, fmt, scale, thresholds in rows:
+                value = getattr(metrics, name)
+                # CLS of 0 is a real (perfect) score; for the others 0 means "not measured"
+                if value is None or (not value and name != "cumulative_layout_shift"):
+                    continue
+                line = f"{label}: {fmt.format(value * scale if scale != 1 else value)}"
+                if thresholds:
+                    line += f" ({_rate(value, thresholds)})"
+                lines.append(line)
+        lines.append("=" * 60)
+        print("\n".join(lines))
 
 
 # Context manager for easy performance monitoring
@@ -424,38 +792,3 @@ class PerformanceTestAsync:
         """Measure performance for the given page"""
         self.metrics = await self.monitor.measure_page_performance(page, self.url)
         return self.metrics
-
-
-# SPA Route Change Helpers
-async def wait_for_route_change(page: Page, timeout: int = 5000) -> bool:
-    """
-    Waits for a client-side route change triggered via pushState/replaceState/popstate.
-    Returns True if a route change was detected within timeout, else False.
-    """
-    prev = await page.evaluate("() => window.__routeChangeId || 0")
-    try:
-        await page.wait_for_function(
-            "prev => (window.__routeChangeId || 0) !== prev",
-            arg=prev,
-            timeout=timeout
-        )
-        return True
-    except Exception:
-        return False
-
-
-async def measure_after_spa_route_change(page: Page, perf_monitor: PerformanceMonitorAsync, 
-                                       label: Optional[str] = None, settle_ms: int = 500, 
-                                       timeout: int = 5000) -> PerformanceMetrics:
-    """
-    Measures performance after a SPA route change without full document navigation.
-    Call this right after triggering the action that changes routes.
-    """
-    changed = await wait_for_route_change(page, timeout=timeout)
-    if not changed:
-        # Optional: still try to measure if your app updates content without modifying history
-        # You can add additional waits here (e.g., a key selector visible)
-        pass
-
-    await page.wait_for_timeout(settle_ms)
-    return await perf_monitor.measure_current_page(page, label=label or f"route:{page.url}")
\ No newline at end of file
@@ -4,14 +4,23 @@ Async helpers for detecting and measuring Single-Page App (SPA) route changes in
 What this module does:
 - Detects client-side navigations triggered via history.pushState, history.replaceState, and popstate.
 - Provides a helper to wait for a route change and a convenience function to measure performance right after it.
-- Designed to work with a PerformanceMonitor that exposes `measure_current_page(page, label=...)`.
+- The route-change signal is sticky, so it is reset (armed) right before the triggering action and consumed
+  after it; only a change caused by that action then satisfies the wait.
+- Designed to work with a PerformanceMonitor that exposes `drain_observed_entries(page, label=...)` and
+  `measure_current_page(page, label=...)`; the former is used when the page has a persistent observer buffer.
 
 Usage:
     from route_change import wait_for_route_change, measure_after_spa_route_change
 
-    # After triggering a SPA navigation (e.g., clicking a link or button):
+    # Pass the action that triggers the SPA navigation (e.g., clicking a link or button):
+    metrics = await measure_after_spa_route_change(
+        page, perf_monitor, label="route:/teams", action=lambda: page.click("nav >> text=Teams")
+    )
+
+    # Or arm and wait around the action yourself:
+    await arm_route_change(page)
     await page.click("nav >> text=Teams")
-    metrics = await measure_after_spa_route_change(page, perf_monitor, label="route:/teams")
+    changed = await wait_for_route_change(page)
 
 Prerequisites:
 - Ensure your test setup injects a small init script on each document to track route changes:
@@ -20,8 +29,10 @@ Prerequisites:
         if (window.__routeChangeInstalled) return;
         window.__routeChangeInstalled = true;
         window.__routeChangeId = 0;
+        window.__routeChangeSignal = false;
         function notifyRouteChange() {
           window.__routeChangeId++;
+          window.__routeChangeSignal = true;
           window.dispatchEvent(new Event('routechange'));
         }
         const _pushState = history.pushState;
@@ -41,29 +52,51 @@ Date: [2025-08-18]
 """
 
 
-__all__ = ["wait_for_route_change", "measure_after_spa_route_change"]
+__all__ = ["arm_route_change", "wait_for_route_change", "measure_after_spa_route_change"]
+
+# Clears any earlier route-change signal before the triggering action
+_ARM_ROUTE_CHANGE_JS = "() => { window.__routeChangeSignal = false; }"
+
+# Reads and clears the route-change signal in one evaluation
+_CONSUME_ROUTE_CHANGE_JS = """
+    () => {
+        if (!window.__routeChangeSignal) return false;
+        window.__routeChangeSignal = false;
+        return true;
+    }
+"""
+
+async def arm_route_change(page):
+    """
+    Resets the route-change signal. Call right before the action being measured,
+    so an earlier route change cannot satisfy the following wait_for_route_change.
+    """
+    await page.evaluate(_ARM_ROUTE_CHANGE_JS)
 
 async def wait_for_route_change(page, timeout=5000):
     """
     Waits for a client-side route change triggered via pushState/replaceState/popstate.
     Returns True if a route change was detected within timeout, else False.
+    Counts any change since the last arm_route_change (or consumed wait), including
+    one that fired between the triggering action and this call.
     """
-    prev = await page.evaluate("() => window.__routeChangeId || 0")
     try:
-        await page.wait_for_function(
-            "prev => (window.__routeChangeId || 0) !== prev",
-            arg=prev,
-            timeout=timeout
-        )
+        # Single round-trip: the predicate consumes the signal set by notifyRouteChange
+        await page.wait_for_function(_CONSUME_ROUTE_CHANGE_JS, timeout=timeout)
         return True
     except Exception:
         return False
     
-async def measure_after_spa_route_change(page, perf_monitor, label=None, settle_ms=500, timeout=5000):
+async def measure_after_spa_route_change(page, perf_monitor, label=None, settle_ms=500, timeout=5000,
+                                         action=None):
     """
     Measures performance after a SPA route change without full document navigation.
-    Call this right after triggering the action that changes routes.
+    With action (an async callable that triggers the route change), the signal is armed
+    before it runs; without, call arm_route_change yourself before triggering the change.
     """
+    if action is not None:
+        await arm_route_change(page)
+        await action()
     changed = await wait_for_route_change(page, timeout=timeout)
     if not changed:
         # Optional: still try to measure if your app updates content without modifying history
@@ -71,4 +104,10 @@ async def measure_after_spa_route_change(page, perf_monitor, label=None, settle_
         pass
 
     await page.wait_for_timeout(settle_ms)
-    return await perf_monitor.measure_current_page(page, label=label or f"route:{page.url}")
\ No newline at end of file
+    label = label or f"route:{page.url}"
+
+    # Pages instrumented by enhanced_page already have long-lived observers; just drain them
+    metrics = await perf_monitor.drain_observed_entries(page, label=label)
+    if metrics is None:
+        metrics = await perf_monitor.measure_current_page(page, label=label)
+    return metrics
\ No newline at end of file